@@ -19,3 +19,262 @@ for i,v in enumerate(views,1):
     print()
 print('Summary:')
 print(problem_summary(c,A,b))
+
+# Presolve keeps the status of a failed solve instead of reporting NaN as optimal.
+from presolve import solve_presolved
+r = solve_presolved([1,1],[[1,1],[1,3]],[2,10],"max",["<=",">="],raise_on_failure=False)
+direct = Simplex([1,1],[[1,1],[1,3]],[2,10],"max",["<=",">="],raise_on_failure=False)
+assert r.status == direct.status == 'infeasible' and r.solution is None, r.status
+assert np.allclose(r.certificate, direct.certificate)
+print('presolve infeasible:', r.status, r.certificate)
+
+# An unused improving column only makes the model unbounded if the rest is feasible.
+c=[0,4,0,0,4,4]
+A=[[-1,-1,2,0,1,0],[1,1,-2,3,0,0],[1,1,-2,0,-1,0]]
+b=[6,1,4]
+bounds=[(0,3),(1,None),(0,1),(0,None),(0,4),(0,None)]
+r = solve_presolved(c,A,b,"max",["<=","<=",">="],bounds=bounds,raise_on_failure=False)
+direct = Simplex(c,A,b,"max",["<=","<=",">="],bounds=bounds,raise_on_failure=False)
+assert r.status == direct.status == 'infeasible', r.status
+r = solve_presolved([1,2],[[1,0]],[3],"max",["<="],raise_on_failure=False)
+assert r.status == 'unbounded' and np.allclose(r.certificate, [0,1]), r.status
+print('presolve pending ray:', r.status, r.certificate)
+
+# The barrier itself converges on a random dense model, without the simplex fallback.
+from interior import interior_point
+rng = np.random.default_rng(0)
+A = rng.uniform(0,10,(200,300)); b = rng.uniform(1,100,200); c = rng.uniform(1,10,300)
+r = interior_point(c,A,b,method="revised",crossover=False,tol=1e-8)
+assert r.barrier_converged and not r.fallback and r.barrier_iterations < 60, r.barrier_iterations
+assert abs(r.objective - Simplex(c,A,b,method="revised").objective) < 1e-6 * abs(r.objective)
+print('barrier iterations:', r.barrier_iterations)
+
+# A free (FR) column survives an MPS round trip and the model still solves.
+import io
+from lpfiles import LPModel, read_mps, write_mps
+model = LPModel([1,2,-1],[[1,1,1],[1,-1,0],[0,1,-1]],[4,1,2],"max",bounds=[(None,None),(-np.inf,3),(-np.inf,None)])
+buf = io.StringIO(); write_mps(model, buf); buf.seek(0)
+text = buf.getvalue()
+assert " FR " in text and " MI " in text, text
+r = read_mps(io.StringIO(text)).solve()
+assert np.isclose(r.objective, 19/3) and np.allclose(r.x, [8/3,5/3,-1/3]), r.x
+print('free column round trip:', r.solution)
+
+# solve_batch: neighbouring scenarios reuse the basis, unrelated ones cost no more than a loop.
+from simplex import solve_batch
+rng = np.random.default_rng(0)
+A = rng.uniform(0,10,(30,40)); c = rng.uniform(1,10,40); b0 = rng.uniform(1,100,30)
+near = b0 * (1 + rng.normal(0,0.02,(20,30)))
+unrelated = rng.uniform(1,100,(20,30))
+for B in (near, unrelated):
+    batch = solve_batch(A,c,B)
+    loop = [Simplex(c,A,bb,method="revised",record="none") for bb in B]
+    assert np.allclose(batch.objective, [r.objective for r in loop])
+    assert batch.iterations.sum() <= sum(r.iterations for r in loop)
+print('batch iterations near/unrelated:', solve_batch(A,c,near).iterations.sum(), solve_batch(A,c,unrelated).iterations.sum())
+
+# float32 certificates are refined in float64: Farkas y and rays hold to float64 accuracy.
+A = np.array([[1.,1.],[1.,-1.]]); r = Simplex([1,1],[[1,1],[1,1]],[1,3],"max",["<=",">="],dtype=np.float32,raise_on_failure=False)
+y = r.certificate
+assert r.status == "infeasible" and y @ np.array([1,3]) < 0, y
+r = Simplex([1,1],A,[4,2],"max",[">=","<="],dtype=np.float32,raise_on_failure=False)
+d = r.certificate / np.abs(r.certificate).max()
+assert r.status == "unbounded" and (A[1] @ d) <= 1e-12 and (A[0] @ d) >= -1e-12 and d.min() >= 0, d
+print('float32 certificates:', y, d)
+
+# The revised (LU) engine reaches the tableau's optimum, with an empty step history.
+rng = np.random.default_rng(1)
+for _ in range(20):
+    A = rng.uniform(0,10,(8,12)); c = rng.uniform(1,10,12); b = rng.uniform(10,50,8)
+    t = Simplex(c,A,b,record="none"); r = Simplex(c,A,b,method="revised")
+    assert np.isclose(t.objective, r.objective) and len(r.steps) == 0
+print('revised vs tableau:', Simplex(c,A,b,method="revised").objective, t.objective)
+
+# The vectorized pivot (min_ratio_row + pivot_tableau) matches the old row-by-row loop.
+from bench_simplex import random_tableau, loop_pivot, vectorized_pivot
+T1 = random_tableau(30, 40, seed=2); T2 = T1.copy()
+for col in (0, 5, 17):
+    loop_pivot(T1, col); vectorized_pivot(T2, col)
+assert np.allclose(T1, T2)
+print('vectorized pivot max diff:', np.abs(T1 - T2).max())
+
+# method="sparse" (CSC input kept sparse) agrees with the dense tableau.
+import scipy.sparse as sps
+A = sps.vstack([sps.random(40, 60, density=0.1, random_state=3) * 10, np.ones((1, 60))], format="csr")
+c = np.arange(1, 61) % 7 + 1.0; b = np.full(41, 20.0)
+s = Simplex(c,A,b,method="sparse"); t = Simplex(c,A.toarray(),b,record="none")
+assert np.isclose(s.objective, t.objective) and (A @ s.x <= b + 1e-9).all()
+print('sparse vs tableau:', s.objective, t.objective)
+
+# record="delta" replays the same tableaux and views as record="all"; "last" keeps the tail.
+A = rng.uniform(0,10,(20,30)); c = rng.uniform(1,10,30); b = rng.uniform(10,50,20)
+full = Simplex(c,A,b,record="all").steps
+delta = Simplex(c,A,b,record="delta").steps
+last = Simplex(c,A,b,record="last",record_size=3).steps
+assert len(delta) == len(full) and all(np.allclose(delta[k], full[k]) for k in range(len(full)))
+assert len(last) == 3 and np.allclose(last[-1], full[-1]) and last.offset == len(full) - 3
+vf, vd = build_iteration_views(full,c,A,b), build_iteration_views(delta,c,A,b)
+assert all(vf[k]['after_df'].equals(vd[k]['after_df']) and vf[k]['entering'] == vd[k]['entering'] for k in range(len(vf)))
+print('delta replay steps:', len(delta), 'ring offset:', last.offset)
+
+# Two-phase: >= and = rows reach the optimum, contradictory rows are reported infeasible.
+r = Simplex([2,3],[[1,1],[1,-1],[1,0]],[10,2,8],"min",[">=","=",">="])
+assert r.status == "optimal" and np.isclose(r.objective, 34) and np.allclose(r.x, [8,6]), r.x
+r = Simplex([1,1],[[1,1],[1,1]],[2,5],"max",["<=","="],raise_on_failure=False)
+assert r.status == "infeasible", r.status
+print('two-phase min:', Simplex([2,3],[[1,1],[1,-1],[1,0]],[10,2,8],"min",[">=","=",">="]).solution)
+
+# Bounds never become rows: same optimum as writing x_j <= u_j as constraints.
+c = [3,5,4]; A = [[1,1,1],[2,1,3]]; b = [10,15]
+r = Simplex(c,A,b,bounds=[(1,4),(0,3),(None,None)])
+rows = Simplex(c,A+[[1,0,0],[0,1,0],[-1,0,0]],b+[4,3,-1])
+assert np.isclose(r.objective, rows.objective) and np.allclose(r.x, rows.x), (r.x, rows.x)
+assert r.steps[0].shape[0] == len(b) + 1
+print('bounded x:', r.x, r.objective)
+
+# Warm start: after a small change in b the old basis needs fewer pivots than a cold solve.
+A = rng.uniform(0,10,(20,30)); c = rng.uniform(1,10,30); b = rng.uniform(10,50,20)
+first = Simplex(c,A,b,method="revised")
+b2 = b * 1.05; b2[0] *= 0.8
+cold = Simplex(c,A,b2,method="revised"); warm = Simplex(c,A,b2,method="revised",basis=first.basis)
+assert np.isclose(cold.objective, warm.objective) and warm.iterations < cold.iterations
+print('warm/cold iterations:', warm.iterations, cold.iterations)
+
+# Every pricing rule reaches the same optimum, and Beale's cycling example terminates.
+A = rng.uniform(0,10,(10,15)); c = rng.uniform(1,10,15); b = rng.uniform(10,50,10)
+objs = [Simplex(c,A,b,pricing=p,record="none").objective for p in ("dantzig","bland","steepest-edge","devex")]
+assert np.allclose(objs, objs[0]), objs
+r = Simplex([0.75,-150,0.02,-6],[[0.25,-60,-0.04,9],[0.5,-90,-0.02,3],[0,0,1,0]],[0,0,1],record="none")
+assert np.isclose(r.objective, 0.05), r.objective
+print('pricing objectives:', np.round(objs, 6), 'Beale Z:', r.objective)
+
+# x, duals and reduced costs come straight from the final basis (Wyndor Glass).
+r = Simplex([3,5],[[1,0],[0,2],[3,2]],[4,12,18])
+assert np.allclose(r.x, [2,6]) and np.isclose(r.objective, 36)
+assert np.allclose(r.duals, [0,1.5,1]) and np.allclose(r.reduced_costs, [0,0])
+print('Wyndor x/duals:', r.x, r.duals)
+
+# Scaling changes nothing but the arithmetic: badly scaled rows give the same answer.
+A = np.array([[1e4,2e4],[3e-3,1e-3],[1,1]]); b = [4e4,3e-3,5]
+for method in ("geometric","equilibrium"):
+    r = Simplex([1,2],A,b,scaling=method,record="none")
+    assert np.isclose(r.objective, Simplex([1,2],A,b,record="none").objective), method
+    assert (A @ r.x <= np.array(b) * (1 + 1e-9)).all()
+print('scaled Z:', r.objective, r.x)
+
+# Branch and bound matches brute-force enumeration on a small integer program.
+import itertools
+from mip import branch_and_bound
+c = [8,11,6,4]; A = [[5,7,4,3],[1,1,1,1]]; b = [14,3]
+best = max(np.dot(c,x) for x in itertools.product(range(2), repeat=4) if (np.array(A) @ x <= b).all())
+for selection in ("best-bound","depth-first"):
+    r = branch_and_bound(c,A,b,bounds=[(0,1)]*4,node_selection=selection)
+    assert r.status == "optimal" and np.isclose(r.objective, best) and np.allclose(r.x, np.round(r.x))
+print('MIP Z:', r.objective, 'brute force:', best, 'nodes:', r.nodes)
+
+# Sensitivity of Wyndor Glass: the textbook ranges for c_j and b_i.
+from sensitivity import sensitivity
+rep = sensitivity([3,5],[[1,0],[0,2],[3,2]],[4,12,18])
+assert np.allclose(rep.shadow_prices, [0,1.5,1])
+assert np.allclose(rep.c_range, [[0,7.5],[2,np.inf]])
+assert np.allclose(rep.b_range, [[2,np.inf],[6,18],[12,24]])
+print('c ranges:', rep.c_range.tolist(), 'b ranges:', rep.b_range.tolist())
+
+# Failures raise with a checkable certificate; raise_on_failure=False returns it on the result.
+from simplex import InfeasibleError, UnboundedError
+try:
+    Simplex([1,1],[[1,1],[-1,-1]],[2,-3])
+    raise AssertionError('infeasible model solved')
+except InfeasibleError as exc:
+    y = exc.certificate
+    assert exc.status == "infeasible" and (y >= 0).all() and y @ [2,-3] < 0 and (y @ np.array([[1,1],[-1,-1]]) >= 0).all(), y
+try:
+    Simplex([1,1],[[1,-1]],[1])
+    raise AssertionError('unbounded model solved')
+except UnboundedError as exc:
+    d = exc.certificate
+    assert (d >= 0).all() and d[0] - d[1] <= 1e-12 and d.sum() > 0, d
+    assert exc.result.status == "unbounded"
+print('certificates:', y, d)
+
+# float32 tableaux take half the memory but report float64-accurate x and duals.
+A = rng.uniform(0,10,(15,20)); c = rng.uniform(1,10,20); b = rng.uniform(10,50,15)
+lo = Simplex(c,A,b,dtype=np.float32); hi = Simplex(c,A,b)
+assert lo.steps[0].dtype == np.float32 and lo.steps[0].nbytes * 2 == hi.steps[0].nbytes
+assert np.isclose(lo.objective, hi.objective, rtol=1e-12) and np.allclose(lo.duals, hi.duals, atol=1e-10)
+print('float32 Z:', lo.objective, hi.objective)
+
+# Kernels: "auto" picks the same pivots as the NumPy kernel; unknown names are rejected.
+from kernels import make_kernel, NUMBA_KERNEL
+a = Simplex(c,A,b,kernel="numpy"); z = Simplex(c,A,b,kernel="auto")
+assert a.steps.pivots == z.steps.pivots and np.isclose(a.objective, z.objective)
+try:
+    make_kernel("cuda")
+    raise AssertionError('unknown kernel accepted')
+except ValueError:
+    pass
+print('kernel auto:', make_kernel("auto"), 'numba available:', NUMBA_KERNEL is not None)
+
+# Limits stop the solve with a resumable basis; a cancelled token stops it at once.
+from simplex import CancelToken, IterationLimitError, CancelledError
+full = Simplex(c,A,b,method="revised")
+part = Simplex(c,A,b,method="revised",max_iter=3,raise_on_failure=False)
+assert part.status == "iteration_limit" and part.iterations == 3
+rest = Simplex(c,A,b,method="revised",basis=part.basis)
+assert np.isclose(rest.objective, full.objective)
+token = CancelToken(); token.cancel()
+try:
+    Simplex(c,A,b,cancel=token,check_every=1)
+    raise AssertionError('cancelled solve finished')
+except CancelledError as exc:
+    assert exc.status == "cancelled"
+print('resumed after limit:', part.iterations, '+', rest.iterations, 'pivots')
+
+# LP format round trip keeps senses, bounds and the optimum.
+from lpfiles import read_lp, write_lp
+model = LPModel([3,2,4],[[1,1,2],[2,0,3],[1,-1,0]],[4,5,1],"max",[">=","<=","="],bounds=[(0,3),(1,None),(0,2)])
+buf = io.StringIO(); write_lp(model, buf); buf.seek(0)
+back = read_lp(buf)
+assert back.constraints == model.constraints and np.allclose(back.A.toarray(), model.A.toarray())
+assert np.isclose(back.solve().objective, model.solve().objective)
+print('LP round trip Z:', back.solve().objective)
+
+# Iteration views are built lazily and cached: indexing twice returns the same view.
+views = build_iteration_views(Simplex(c,A,b).steps,c,A,b)
+assert views[-1] is views[len(views) - 1] and views[0]['index'] == 1
+assert [v['entering'] for v in views[:2]] == [views[0]['entering'], views[1]['entering']]
+print('lazy views:', len(views), views._view.cache_info())
+
+# Basis labels found from unit columns match the recorded basis.
+steps = Simplex([3,5],[[1,0],[0,2],[3,2]],[4,12,18]).steps
+for k in range(len(steps)):
+    found = label_tableau(steps[k],2,3)['VB']
+    given = label_tableau(steps[k],2,3,basis=steps.basis(k))['VB']
+    assert list(found) == list(given), (list(found), list(given))
+print('final basis:', list(label_tableau(steps[-1],2,3)['VB']))
+
+# format_numbers gives exactly what pretty_number gave cell by cell.
+from display import format_numbers, pretty_number
+values = np.concatenate([rng.normal(0,1e3,200), [0,-0.0,1e-9,-1e-9,0.5,-2.25,1e6,123.45678,1/3]])
+assert list(format_numbers(values)) == [pretty_number(v) for v in values]
+assert list(format_numbers(values, 2)) == [pretty_number(v, 2) for v in values]
+print('formatted:', list(format_numbers([1/3,2.5,0,-1e-9])))
+
+# The app's cache key depends on the model's numbers, not on how they were passed.
+try:
+    from app import model_key
+except ImportError:
+    print('model_key check skipped: streamlit is not installed')
+else:
+    assert model_key([3,5],[[1,0],[0,2],[3,2]],[4,12,18]) == model_key(np.array([3.,5.]),np.array([[1,0],[0,2],[3,2]]),(4,12,18))
+    assert model_key([3,5],[[1,0],[0,2],[3,2]],[4,12,18]) != model_key([3,5],[[1,0],[0,2],[3,2]],[4,12,18],"min")
+    print('model_key:', model_key([3,5],[[1,0],[0,2],[3,2]],[4,12,18])[:12])
+
+# Paging a large tableau: every page keeps VB and the pinned objective row.
+from display import page_count, table_window
+df = label_tableau(Simplex(rng.uniform(1,9,45),rng.uniform(0,9,(30,45)),rng.uniform(10,50,30),record="last",record_size=1).steps[-1],45,30)
+assert page_count(len(df) - 1, 20) == 2 and page_count(0, 20) == 1
+pages = [table_window(df, i, j, pin_last_row=True) for i in range(2) for j in range(page_count(df.shape[1] - 1, 12))]
+assert all(p.columns[0] == 'VB' and p.index[-1] == len(df) - 1 for p in pages)
+assert sum(len(p) - 1 for p in pages[::page_count(df.shape[1] - 1, 12)]) == len(df) - 1
+print('pages:', len(pages), 'shape of first:', pages[0].shape)
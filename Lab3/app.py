@@ -1,13 +1,23 @@
+import hashlib
+
+import numpy as np
 import streamlit as st
 import pandas as pd
-from numbers import Number
 
 from simplex import Simplex
+from interior import interior_point
+from sensitivity import sensitivity
 from display import (
     problem_summary,
     build_iteration_views,
+    format_frame,
     label_tableau,
+    page_count,
+    table_window,
+    PAGE_COLS,
+    PAGE_ROWS,
     pretty_number,
+    sensitivity_tables,
 )
 from parser_ai import parse_problem
 
@@ -65,7 +75,7 @@ def parse_manual_input(c_text: str, constraints_text: str):
         raise ValueError("Ingresa al menos una restriccion.")
 
     allowed_signs = ["<=", ">=", "="]
-    A, b = [], []
+    A, b, senses = [], [], []
     for line in lines:
         sign_found = None
         for sign in allowed_signs:
@@ -76,9 +86,6 @@ def parse_manual_input(c_text: str, constraints_text: str):
         if not sign_found or len(partes) != 2:
             raise ValueError(f"No pude interpretar la restriccion: '{line}'. Usa el formato '1,2 <= 6'.")
 
-        if sign_found != "<=":
-            raise ValueError("Por ahora solo se aceptan restricciones '<=' en modo manual.")
-
         lhs, rhs = partes[0], partes[1]
         try:
             coeficientes = [float(x.strip()) for x in lhs.replace(" ", "").split(",") if x.strip()]
@@ -94,8 +101,9 @@ def parse_manual_input(c_text: str, constraints_text: str):
 
         A.append(coeficientes)
         b.append(b_i)
+        senses.append(sign_found)
 
-    return c, A, b
+    return c, A, b, senses
 
 
 def style_simplex_table(df: pd.DataFrame, pivot_row=None, pivot_col=None):
@@ -103,15 +111,10 @@ def style_simplex_table(df: pd.DataFrame, pivot_row=None, pivot_col=None):
     Devuelve un Styler de pandas listo para Streamlit.
     Se convierte todo a texto para evitar problemas de Arrow
     y se aplican colores a fila, columna y elemento pivote.
+    Solo se estilizan esas celdas (set_properties sobre subconjuntos),
+    sin construir una tabla de estilos del tamano de df.
     """
-    df_display = df.copy()
-
-    def _to_display(value):
-        if isinstance(value, Number):
-            return pretty_number(value, decimals=4)
-        return str(value)
-
-    df_display = df_display.applymap(_to_display)
+    df_display = format_frame(df, decimals=4)
 
     styled = (
         df_display.style.set_table_styles(
@@ -123,43 +126,167 @@ def style_simplex_table(df: pd.DataFrame, pivot_row=None, pivot_col=None):
         )
     )
 
-    def _highlight(data):
-        styles = pd.DataFrame("", index=data.index, columns=data.columns)
-        if pivot_col and pivot_col in styles.columns:
-            styles.loc[:, pivot_col] = styles.loc[:, pivot_col] + "background-color: rgba(74, 222, 128, 0.35);"
-        if pivot_row is not None and pivot_row in styles.index:
-            styles.loc[pivot_row, :] = styles.loc[pivot_row, :] + "background-color: rgba(56, 189, 248, 0.35);"
-        if (
-            pivot_row is not None
-            and pivot_col
-            and pivot_col in styles.columns
-            and pivot_row in styles.index
-        ):
-            styles.loc[pivot_row, pivot_col] = "background-color: #f97316; color: #0f172a; font-weight: 600;"
-        return styles
-
-    return styled.apply(_highlight, axis=None)
-
-
-def run_simplex(c, A, b, sense="max"):
-    steps, solution = Simplex(c, A, b, sense=sense)
+    has_col = bool(pivot_col) and pivot_col in df_display.columns
+    has_row = pivot_row is not None and pivot_row in df_display.index
+    if has_col:
+        styled = styled.set_properties(subset=[pivot_col], **{"background-color": "rgba(74, 222, 128, 0.35)"})
+    if has_row:
+        styled = styled.set_properties(
+            subset=pd.IndexSlice[[pivot_row], :], **{"background-color": "rgba(56, 189, 248, 0.35)"}
+        )
+    if has_col and has_row:
+        styled = styled.set_properties(
+            subset=pd.IndexSlice[[pivot_row], [pivot_col]],
+            **{"background-color": "#f97316", "color": "#0f172a", "font-weight": "600"},
+        )
+    return styled
+
+
+# Iteraciones por pagina en "Ver todas las iteraciones".
+ITERATIONS_PER_PAGE = 5
+
+
+def render_table(df: pd.DataFrame, key: str, pivot_row=None, pivot_col=None, pin_last_row=False):
+    """
+    Muestra df con st.table por ventanas: a lo sumo PAGE_ROWS filas y
+    PAGE_COLS columnas (mas la primera columna y, con pin_last_row, la fila
+    objetivo). Los selectores de pagina solo aparecen si df no cabe en una
+    ventana, y abren en la ventana que contiene el pivote. Solo se formatea
+    y estiliza la ventana, asi la pagina sigue liviana con cualquier modelo.
+    `key` debe ser unica para cada tabla de la pagina.
+    """
+    n_rows = len(df) - 1 if pin_last_row else len(df)
+    row_pages = page_count(n_rows, PAGE_ROWS)
+    col_pages = page_count(df.shape[1] - 1, PAGE_COLS)
+    row_page = col_page = 0
+    if row_pages > 1 or col_pages > 1:
+        if pivot_row is not None and pivot_row in df.index:
+            row_page = min(df.index.get_loc(pivot_row) // PAGE_ROWS, row_pages - 1)
+        if pivot_col and pivot_col in df.columns:
+            col_page = max(df.columns.get_loc(pivot_col) - 1, 0) // PAGE_COLS
+        sel_rows, sel_cols = st.columns(2)
+        if row_pages > 1:
+            row_page = sel_rows.number_input(
+                f"Pagina de filas (de {row_pages})", 1, row_pages, row_page + 1, key=f"{key}_rows"
+            ) - 1
+        if col_pages > 1:
+            col_page = sel_cols.number_input(
+                f"Pagina de columnas (de {col_pages})", 1, col_pages, col_page + 1, key=f"{key}_cols"
+            ) - 1
+        st.caption(
+            "Filas {}-{} de {}, columnas {}-{} de {}".format(
+                row_page * PAGE_ROWS + 1,
+                min((row_page + 1) * PAGE_ROWS, n_rows),
+                n_rows,
+                col_page * PAGE_COLS + 1,
+                min((col_page + 1) * PAGE_COLS, df.shape[1] - 1),
+                df.shape[1] - 1,
+            )
+        )
+    window = table_window(df, row_page, col_page, pin_last_row=pin_last_row)
+    st.table(style_simplex_table(window, pivot_row=pivot_row, pivot_col=pivot_col))
+
+
+SOLVERS = {
+    "simplex": "Simplex (tabla)",
+    "interior": "Punto interior + crossover",
+}
+
+# Ninguna solicitud ocupa un hilo del servidor por mas tiempo que esto.
+SOLVE_TIME_LIMIT = 20.0
+SOLVE_MAX_ITER = 20000
+
+
+# Las soluciones y las vistas de iteraciones viven en caches del proceso
+# compartidas por todas las sesiones, con el contenido del modelo como llave:
+# un modelo identico se resuelve una sola vez.
+SOLVE_CACHE_SIZE = 64
+VIEWS_CACHE_SIZE = 16
+CACHE_TTL = 3600
+
+
+def model_key(c, A, b, sense="max", constraints=None, solver="simplex"):
+    """
+    SHA-256 de los numeros del modelo (como float64, con sus dimensiones),
+    el sentido, los signos de las restricciones y el solver: modelos iguales
+    dan llaves iguales sin importar si vienen de listas o de arreglos.
+    """
+    digest = hashlib.sha256()
+    for values in (c, A, b):
+        # Sumar 0.0 convierte -0.0 en 0.0, que si no daria otro hash.
+        array = np.ascontiguousarray(values, dtype=np.float64) + 0.0
+        digest.update(repr(array.shape).encode())
+        digest.update(array.tobytes())
+    row_senses = None if constraints is None else list(constraints)
+    digest.update(repr((sense, row_senses, solver)).encode())
+    return digest.hexdigest()
+
+
+def _solve_model(c, A, b, sense="max", constraints=None, solver="simplex"):
+    """
+    Resuelve el modelo y guarda lo que necesitan las vistas. Con
+    solver="interior" se usa el metodo de barrera y un crossover a una base,
+    asi las tablas siguen mostrando los (pocos) pivoteos simplex que cierran
+    la solucion. La resolucion se corta tras SOLVE_TIME_LIMIT segundos o
+    SOLVE_MAX_ITER pivoteos (el error indica cual). "method" es el metodo
+    que resolvio de verdad: "simplex" si el punto interior no convergio.
+    """
+    if solver == "interior":
+        result = interior_point(c, A, b, sense=sense, constraints=constraints, time_limit=SOLVE_TIME_LIMIT)
+        method = "simplex" if result.fallback else "interior"
+    else:
+        result = Simplex(c, A, b, sense=sense, constraints=constraints, max_iter=SOLVE_MAX_ITER, time_limit=SOLVE_TIME_LIMIT)
+        method = "simplex"
+    steps, solution = result
+    try:
+        report = sensitivity(c, A, b, sense, constraints, result=result)
+    except ValueError:
+        report = None
     return {
         "c": c,
         "A": A,
         "b": b,
         "sense": sense,
+        "constraints": constraints,
+        "solver": solver,
+        "method": method,
         "steps": steps,
         "solution": solution,
+        "sensitivity": report,
     }
 
 
+@st.cache_resource(max_entries=SOLVE_CACHE_SIZE, ttl=CACHE_TTL, show_spinner="Resolviendo el modelo...")
+def _cached_solve(key, _model):
+    # Solo se hashea la llave; el modelo pasa sin hashear (guion bajo inicial).
+    return _solve_model(**_model)
+
+
+def run_simplex(c, A, b, sense="max", constraints=None, solver="simplex"):
+    """
+    Resuelve a traves de la cache compartida. El dict devuelto es el mismo
+    para todas las sesiones que enviaron el mismo modelo, asi que no debe
+    modificarse. Las resoluciones fallidas lanzan la excepcion y no se guardan.
+    """
+    key = model_key(c, A, b, sense, constraints, solver)
+    model = {"c": c, "A": A, "b": b, "sense": sense, "constraints": constraints, "solver": solver}
+    return {**_cached_solve(key, model), "key": key}
+
+
+@st.cache_resource(max_entries=VIEWS_CACHE_SIZE, ttl=CACHE_TTL, show_spinner=False)
+def _cached_views(key, _result):
+    return build_iteration_views(_result["steps"], _result["c"], _result["A"], _result["b"], sense=_result["sense"])
+
+
 def chunked(seq, size):
     for i in range(0, len(seq), size):
         yield seq[i : i + size]
 
 
-def render_solution(solution, n_vars):
-    st.subheader("Solucion optima (metodo Simplex)")
+def render_solution(solution, n_vars, method="simplex", solver="simplex"):
+    st.subheader(f"Solucion optima - {SOLVERS[method]}")
+    if method != solver:
+        st.caption("El punto interior no convergio; el modelo se resolvio con el metodo Simplex.")
     vars_sorted = [f"x{i+1}" for i in range(n_vars)]
     valores = [pretty_number(solution.get(var, 0), decimals=4) for var in vars_sorted]
 
@@ -170,14 +297,31 @@ def render_solution(solution, n_vars):
     st.metric(label="Z", value=pretty_number(solution.get("Z", 0), decimals=4))
 
 
+def render_sensitivity(result):
+    report = result.get("sensitivity")
+    if report is None:
+        return
+    st.subheader("Analisis de sensibilidad")
+    st.caption(
+        "Rangos en los que la base optima se mantiene: para cada c_j la solucion no cambia; "
+        "para cada b_i los precios sombra siguen siendo validos."
+    )
+    variables, rows = sensitivity_tables(report, result.get("constraints"))
+    st.caption("Coeficientes de la funcion objetivo")
+    render_table(variables, key="sens_vars")
+    st.caption("Lado derecho de las restricciones")
+    render_table(rows, key="sens_rows")
+
+
 def show_iterations(result):
-    c, A, b, steps, sense = result["c"], result["A"], result["b"], result["steps"], result["sense"]
-    views = build_iteration_views(steps, c, A, b, sense=sense)
+    c, b, steps = result["c"], result["b"], result["steps"]
+    # Se guardan por modelo: al mover el slider (y en otras sesiones) se reusan las vistas ya construidas.
+    views = _cached_views(result["key"], result)
 
     if not views:
         st.info("No se detectaron iteraciones intermedias; se mostro la tabla final directamente.")
-        final_df = label_tableau(steps[-1], len(c), len(b))
-        st.table(style_simplex_table(final_df))
+        final_df = label_tableau(steps[-1], len(c), len(b), steps.columns(-1), basis=steps.basis(-1))
+        render_table(final_df, key="final", pin_last_row=True)
         return
 
     st.subheader("Iteraciones del metodo")
@@ -208,21 +352,35 @@ def show_iterations(result):
                 unsafe_allow_html=True,
             )
 
-    st.caption("Tabla antes del pivote")
-    st.table(
-        style_simplex_table(
-            view["before_df"],
-            pivot_row=view.get("pivot_row"),
-            pivot_col=view.get("pivot_col_name"),
+    if view.get("bound_flip"):
+        st.caption(
+            f"{view['entering']} pasa a su otra cota sin pivoteo; su columna se complementa (x' = u - x)."
         )
+
+    # Las llaves llevan la iteracion, asi cada una abre en la ventana de su pivote.
+    st.caption("Tabla antes del pivote")
+    render_table(
+        view["before_df"],
+        key=f"before_{idx}",
+        pivot_row=view.get("pivot_row"),
+        pivot_col=view.get("pivot_col_name"),
+        pin_last_row=True,
     )
     st.caption("Resultado despues del pivote")
-    st.table(style_simplex_table(view["after_df"]))
-
-    with st.expander("Ver todas las iteraciones (tabla despues del pivote)"):
-        for v in views:
+    render_table(view["after_df"], key=f"after_{idx}", pin_last_row=True)
+
+    # Un expander ejecuta su cuerpo aunque este cerrado: las vistas se construyen
+    # solo a pedido, y solo las de la pagina mostrada.
+    if st.checkbox("Ver todas las iteraciones (tabla despues del pivote)"):
+        pages = page_count(len(views), ITERATIONS_PER_PAGE)
+        page = 0
+        if pages > 1:
+            page = st.number_input(f"Pagina de iteraciones (de {pages})", 1, pages, 1, key="all_page") - 1
+        first = page * ITERATIONS_PER_PAGE
+        for k in range(first, min(first + ITERATIONS_PER_PAGE, len(views))):
+            v = views[k]
             st.markdown(f"**Iteracion {v['index']}**")
-            st.table(style_simplex_table(v["after_df"]))
+            render_table(v["after_df"], key=f"all_{k}", pin_last_row=True)
 
 
 def main():
@@ -270,7 +428,7 @@ def main():
                 value=st.session_state["manual_c"],
             )
             constraints_text = st.text_area(
-                "Restricciones (una por linea, formato `1,2 <= 6`)",
+                "Restricciones (una por linea, formato `1,2 <= 6`; tambien `>=` y `=`)",
                 key="manual_constraints",
                 value=st.session_state["manual_constraints"],
                 height=120,
@@ -280,14 +438,19 @@ def main():
                 options=["max", "min"],
                 format_func=lambda x: "Maximizar" if x == "max" else "Minimizar",
             )
+            solver = st.selectbox(
+                "Metodo de solucion",
+                options=list(SOLVERS),
+                format_func=SOLVERS.get,
+            )
             submitted = st.form_submit_button("Resolver problema")
 
         if submitted:
             try:
                 st.session_state["manual_c"] = c_text
                 st.session_state["manual_constraints"] = constraints_text
-                c, A, b = parse_manual_input(c_text, constraints_text)
-                st.session_state["result"] = run_simplex(c, A, b, sense=sense)
+                c, A, b, senses = parse_manual_input(c_text, constraints_text)
+                st.session_state["result"] = run_simplex(c, A, b, sense=sense, constraints=senses, solver=solver)
                 st.session_state["error"] = None
             except Exception as exc:
                 st.session_state["error"] = str(exc)
@@ -331,7 +494,12 @@ def main():
 
             with col_resolver:
                 if st.button("Resolver este modelo (IA)"):
-                    st.session_state["result"] = run_simplex(ia_model["c"], ia_model["A"], ia_model["b"], sense="max")
+                    try:
+                        st.session_state["result"] = run_simplex(ia_model["c"], ia_model["A"], ia_model["b"], sense="max")
+                        st.session_state["error"] = None
+                    except Exception as exc:
+                        st.session_state["error"] = str(exc)
+                        st.session_state["result"] = None
 
     if st.session_state["error"]:
         st.error(st.session_state["error"])
@@ -340,11 +508,12 @@ def main():
     if result:
         st.divider()
         st.subheader("Modelo del problema")
-        resumen = problem_summary(result["c"], result["A"], result["b"], result["sense"])
+        resumen = problem_summary(result["c"], result["A"], result["b"], result["sense"], result.get("constraints"))
         st.code(resumen)
 
         show_iterations(result)
-        render_solution(result["solution"], n_vars=len(result["c"]))
+        render_solution(result["solution"], n_vars=len(result["c"]), method=result["method"], solver=result["solver"])
+        render_sensitivity(result)
 
 
 if __name__ == "__main__":
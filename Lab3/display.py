@@ -1,50 +1,90 @@
+from collections.abc import Sequence
+from functools import lru_cache
+
 import numpy as np
 import pandas as pd
 
+from simplex import DEFAULT_TOLERANCES, DTYPES, min_ratio_row, tolerances_for
+
+
+def _basis_labels(tableau: np.ndarray, cols_names, tolerances=None, basis=None):
+    """
+    "VB" column: the basic variable of each constraint row, then "Z".
+    `basis` (the basic column index of each row, as the solver keeps it)
+    is used as given; otherwise a row is labeled with the first column that
+    is the unit vector of that row, "—" if there is none.
+    """
+    n_rows = tableau.shape[0] - 1
+    names = np.asarray(cols_names[:-1], dtype=object)
+    if basis is not None:
+        return list(names[np.asarray(basis, dtype=int)]) + ["Z"]
+    tol = (tolerances or DEFAULT_TOLERANCES).pivot
+    body = tableau[:n_rows, :len(names)]
+    # A unit column has a single entry off zero, and that entry is 1.
+    off_zero = np.abs(body) > tol
+    unit = (np.abs(body - 1.0) <= tol) & (off_zero.sum(axis=0) == 1)
+    found = unit.any(axis=1)
+    labels = np.where(found, names[unit.argmax(axis=1)], "—")
+    return list(labels) + ["Z"]
+
 
-def _basis_labels(tableau: np.ndarray, n_vars: int, n_cons: int, cols_names):
-    labels = []
-    for r in range(n_cons):
-        name = "—"
-        for j in range(n_vars + n_cons):
-            col = tableau[:n_cons, j]
-            if np.isclose(tableau[r, j], 1.0) and np.allclose(np.delete(col, r), 0.0):
-                name = cols_names[j]
-                break
-        labels.append(name)
-    labels.append("Z")
-    return labels
+def _float_array(values, dtype=None):
+    """`values` as a float array; float32 data stays float32 unless `dtype` says otherwise."""
+    values = np.asarray(values)
+    if dtype is None:
+        dtype = values.dtype if values.dtype in DTYPES else np.float64
+    if np.dtype(dtype) not in DTYPES:
+        raise ValueError(f"Precision desconocida: '{dtype}'. Usa float32 o float64.")
+    return values.astype(dtype, copy=False)
 
 
-def label_tableau(tableau: np.ndarray, n_vars: int, n_cons: int) -> pd.DataFrame:
+def default_columns(n_vars: int, n_cons: int):
+    """Column names of an all-'<=' tableau: x1..xn, s1..sm."""
+    return [f"x{i+1}" for i in range(n_vars)] + [f"s{i+1}" for i in range(n_cons)]
+
+
+def label_tableau(tableau: np.ndarray, n_vars: int, n_cons: int, columns=None, tolerances=None, dtype=None, basis=None) -> pd.DataFrame:
     """
     Produce a labeled DataFrame for a tableau without changing any values.
     Adds 'VB' (variable básica) and a helper 'Z' column for didactic display.
+    `columns` names the variable columns (surplus/artificial included); by
+    default they are x1..xn, s1..sm. `tolerances` (simplex.Tolerances) sets
+    how close to a unit column a basic column must be. `dtype` (float32 or
+    float64) is the precision of the DataFrame; by default a float32 tableau
+    stays float32 and is labeled with simplex.LOW_PRECISION_TOLERANCES.
+    `basis` (basic column index per row, e.g. StepHistory.basis(k)) names
+    the basic variables directly instead of searching for unit columns.
     """
-    cols = [f"x{i+1}" for i in range(n_vars)] + [f"s{i+1}" for i in range(n_cons)] + ["RHS"]
+    tableau = _float_array(tableau, dtype)
+    if tolerances is None:
+        tolerances = tolerances_for(tableau.dtype)
+    if columns is None:
+        columns = default_columns(n_vars, n_cons)
+    cols = list(columns) + ["RHS"]
     df = pd.DataFrame(tableau.copy(), columns=cols)
 
-    vb = _basis_labels(tableau, n_vars, n_cons, cols)
+    vb = _basis_labels(tableau, cols, tolerances, basis)
     df.insert(0, "VB", vb)
 
     # Add a didactic Z column (0 in constraints rows, 1 in last row)
-    z_col = [0.0] * n_cons + [1.0]
+    z_col = [0.0] * (tableau.shape[0] - 1) + [1.0]
     df.insert(1, "Z", z_col)
 
     return df
 
 
-def compute_pivot_indices(tableau: np.ndarray):
-    """Return (row, col) for the pivot based on current tableau. If optimal, returns (None, None)."""
+def compute_pivot_indices(tableau: np.ndarray, tolerances=None):
+    """
+    Return (row, col) for the pivot based on current tableau. If optimal,
+    returns (None, None); if no row limits the entering column (unbounded
+    direction), returns (None, col).
+    """
+    tols = tolerances or tolerances_for(tableau.dtype)
     last_row = tableau[-1, :-1]
-    if np.all(last_row >= -1e-12):  # numerical tolerance
+    if np.all(last_row >= -tols.dual):
         return None, None
     col = int(np.argmin(last_row))
-    ratios = [
-        tableau[i, -1] / tableau[i, col] if tableau[i, col] > 0 else np.inf
-        for i in range(tableau.shape[0] - 1)
-    ]
-    row = int(np.argmin(ratios)) if len(ratios) > 0 else None
+    row = min_ratio_row(tableau, col, tols.pivot) if tableau.shape[0] > 1 else None
     return row, col
 
 
@@ -57,6 +97,53 @@ def pretty_number(x, decimals: int = 4):
         return x
 
 
+def format_numbers(values, decimals: int = 4) -> np.ndarray:
+    """
+    pretty_number() over a whole array at once: every distinct value is
+    formatted a single time (tableaux repeat 0 and 1 a lot) with one
+    vectorized "%.{decimals}f" and trailing-zero strip. Returns an object
+    array of strings with the shape of `values`.
+    """
+    values = np.asarray(values, dtype=float)
+    unique, inverse = np.unique(values.ravel(), return_inverse=True)
+    text = np.char.mod(f"%.{decimals}f", unique)
+    if decimals > 0:
+        text = np.char.rstrip(np.char.rstrip(text, "0"), ".")
+    # Same zero test as np.isclose(x, 0).
+    text = np.where(np.abs(unique) <= 1e-8, "0", text).astype(object)
+    return text[inverse].reshape(values.shape)
+
+
+def format_frame(df: pd.DataFrame, decimals: int = 4) -> pd.DataFrame:
+    """
+    Copy of df with every cell as text: numbers (and numeric strings) go
+    through one format_numbers call for the whole frame, anything else
+    through str().
+    """
+    text = np.empty(df.shape, dtype=object)
+    numeric_cols = np.array([
+        pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column) for _, column in df.items()
+    ], dtype=bool)
+    if numeric_cols.any():
+        text[:, numeric_cols] = format_numbers(df.iloc[:, numeric_cols].to_numpy(dtype=float), decimals)
+    for j in np.flatnonzero(~numeric_cols):
+        column = df.iloc[:, j]
+        numbers = pd.to_numeric(column, errors="coerce")
+        numeric = numbers.notna().to_numpy()
+        text[:, j] = column.astype(str).to_numpy(dtype=object)
+        if numeric.any():
+            text[numeric, j] = format_numbers(numbers.to_numpy()[numeric], decimals)
+    return pd.DataFrame(text, index=df.index, columns=df.columns)
+
+
+def _text_table(df: pd.DataFrame) -> str:
+    """df.to_string(index=False) for a frame of strings: right-aligned columns, one space apart."""
+    cells = np.vstack([np.array(df.columns, dtype=str), df.to_numpy(dtype=str)])
+    widths = np.char.str_len(cells).max(axis=0)
+    padded = [np.char.rjust(cells[:, j], widths[j]) for j in range(cells.shape[1])]
+    return "\n".join(" ".join(row) for row in zip(*padded))
+
+
 def annotate_pivot(df: pd.DataFrame, pivot_row: int, pivot_col_name: str) -> pd.DataFrame:
     """Return a copy of df where the pivot cell is bracketed for visual emphasis."""
     # Cast to object to allow string annotation without dtype warnings
@@ -73,28 +160,82 @@ def annotate_pivot(df: pd.DataFrame, pivot_row: int, pivot_col_name: str) -> pd.
     return df2
 
 
+PAGE_ROWS = 20
+PAGE_COLS = 12
+
+
+def page_count(n: int, page_size: int) -> int:
+    """Pages needed for n items (at least one, even when n is 0)."""
+    return max(1, -(-n // page_size))
+
+
+def table_window(df: pd.DataFrame, row_page: int = 0, col_page: int = 0, page_rows: int = PAGE_ROWS,
+                 page_cols: int = PAGE_COLS, pin_last_row: bool = False) -> pd.DataFrame:
+    """
+    One page of df: rows row_page * page_rows onwards and, after the first
+    column (VB, always kept so rows stay identifiable), columns col_page *
+    page_cols onwards. With pin_last_row the last row (the objective row of
+    a tableau) is left out of the paging and appended to every page.
+    Index labels and column names are kept, so pivot labels still match.
+    """
+    n_rows = len(df) - 1 if pin_last_row else len(df)
+    r0 = row_page * page_rows
+    rows = list(range(r0, min(r0 + page_rows, n_rows)))
+    if pin_last_row and len(df):
+        rows.append(len(df) - 1)
+    c0 = 1 + col_page * page_cols
+    cols = [0] + list(range(c0, min(c0 + page_cols, df.shape[1])))
+    return df.iloc[rows, cols]
+
+
 def dataframe_to_text(df: pd.DataFrame) -> str:
     # Format numeric cells nicely for text output
-    df_fmt = df.copy()
-    for c in df_fmt.columns:
-        if c in ("VB",):
-            continue
-        df_fmt[c] = df_fmt[c].map(lambda v: pretty_number(v) if isinstance(v, (int, float, np.floating)) or str(v).replace('.', '', 1).lstrip('-').isdigit() else v)
-    return df_fmt.to_string(index=False)
+    return _text_table(format_frame(df))
 
 
-def problem_summary(c, A, b, sense: str = "max") -> str:
+def problem_summary(c, A, b, sense: str = "max", constraints=None) -> str:
     # Build a human-friendly summary of the LP
     s_obj = "Maximizar" if sense == "max" else "Minimizar"
     obj = " + ".join([f"{pretty_number(ci)} x{i+1}" for i, ci in enumerate(c)])
     lines = [f"{s_obj}: Z = {obj}", "Sujeto a:"]
     for i, row in enumerate(A):
         cons = " + ".join([f"{pretty_number(aij)} x{j+1}" for j, aij in enumerate(row)])
-        lines.append(f"  {cons} <= {pretty_number(b[i])}")
+        sign = constraints[i] if constraints is not None else "<="
+        lines.append(f"  {cons} {sign} {pretty_number(b[i])}")
     lines.append(f"Variables: x1..x{len(c)} >= 0")
     return "\n".join(lines)
 
 
+def sensitivity_tables(report, constraints=None):
+    """
+    Two DataFrames for a sensitivity.SensitivityReport: one row per variable
+    (value, reduced cost, c_j and its allowable increase/decrease) and one
+    per constraint (shadow price, b_i and its allowable increase/decrease).
+    """
+    n, m = len(report.c), len(report.b)
+    variables = pd.DataFrame(
+        {
+            "Variable": [f"x{j+1}" for j in range(n)],
+            "Valor": report.x,
+            "Costo reducido": report.reduced_costs,
+            "c_j": report.c,
+            "Aumento permitido": report.c_increase,
+            "Disminucion permitida": report.c_decrease,
+        }
+    )
+    senses = constraints if constraints is not None else ["<="] * m
+    rows = pd.DataFrame(
+        {
+            "Restriccion": [f"R{i+1} ({senses[i]})" for i in range(m)],
+            "Precio sombra": report.shadow_prices,
+            "b_i": report.b,
+            "Aumento permitido": report.b_increase,
+            "Disminucion permitida": report.b_decrease,
+        }
+    )
+    return variables, rows
+
+
 def ShowTable(tableau, num_vars, num_constraints, titulo="Tabla"):
     # Backwards-compatible function kept for external calls. Prints a plain table.
     df = label_tableau(np.array(tableau, dtype=float), num_vars, num_constraints)
@@ -103,48 +244,95 @@ def ShowTable(tableau, num_vars, num_constraints, titulo="Tabla"):
     return df
 
 
-def build_iteration_views(steps, c, A, b, sense="max"):
+VIEW_CACHE_SIZE = 32
+
+
+def build_iteration_views(steps, c, A, b, sense="max", tolerances=None, cache_size=VIEW_CACHE_SIZE):
     """
-    From a list of raw tableaux, create a list of dicts representing each pivot iteration.
-    Each dict contains:
+    From a list of raw tableaux (or a StepHistory, including delta records that
+    are replayed here on demand), create the sequence of pivot iterations
+    (an IterationViews: each one is built when indexed). Each view is a dict with:
       - index: iteration number (1-based)
       - before_df: labeled DataFrame before pivot (with pivot cell marked)
       - after_df: labeled DataFrame after pivot
       - entering: entering variable name (e.g., x2)
       - leaving: leaving variable name (e.g., s1)
+    Steps that start a new phase (e.g. Phase I -> Phase II of the two-phase
+    method) have no pivot, so their entering/leaving are None. A bounded
+    variable jumping to its other bound has `bound_flip` set and no leaving.
+    `tolerances` should be the ones the tableaux were solved with.
+    """
+    return IterationViews(steps, len(c), len(b), tolerances, cache_size)
+
+
+class IterationViews(Sequence):
     """
-    n_vars = len(c)
-    n_cons = len(b)
-    views = []
-    total_pivots = max(0, len(steps) - 1)
-    col_names = [f"x{i+1}" for i in range(n_vars)] + [f"s{i+1}" for i in range(n_cons)]
+    Lazy sequence of iteration views: views[k] labels tableaux k and k + 1
+    only when it is indexed, and the last `cache_size` views built are kept
+    (LRU), so moving a slider back and forth costs one view per new step.
+    """
+
+    def __init__(self, steps, n_vars, n_cons, tolerances=None, cache_size=VIEW_CACHE_SIZE):
+        self._steps = steps
+        self._n_vars = n_vars
+        self._n_cons = n_cons
+        self._tolerances = tolerances
+        self._default_names = default_columns(n_vars, n_cons)
+        # A StepHistory knows the pivots it recorded (and how many steps its ring
+        # buffer dropped); a plain list of tableaux gets them recomputed.
+        self._pivots = getattr(steps, "pivots", None)
+        self._has_bases = hasattr(steps, "basis")
+        self._offset = getattr(steps, "offset", 0)
+        self._view = lru_cache(maxsize=cache_size)(self._build)
+
+    def __len__(self):
+        return max(0, len(self._steps) - 1)
 
-    for k in range(total_pivots):
-        t_before = np.array(steps[k], dtype=float)
-        t_after = np.array(steps[k + 1], dtype=float)
-        # Compute pivot on the tableau BEFORE the pivot
-        prow, pcol = compute_pivot_indices(t_before)
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return [self[i] for i in range(*k.indices(len(self)))]
+        n = len(self)
+        if k < 0:
+            k += n
+        if not 0 <= k < n:
+            raise IndexError("indice de iteracion fuera de rango")
+        return self._view(k)
 
-        before_df = label_tableau(t_before, n_vars, n_cons)
-        entering = col_names[pcol] if pcol is not None else None
+    def _build(self, k):
+        steps, tolerances = self._steps, self._tolerances
+        n_vars, n_cons = self._n_vars, self._n_cons
+        t_before = _float_array(steps[k])
+        t_after = _float_array(steps[k + 1])
+        names_before = steps.columns(k) if self._pivots is not None else self._default_names
+        names_after = steps.columns(k + 1) if self._pivots is not None else self._default_names
+        if self._pivots is not None:
+            prow, pcol = self._pivots[k] or (None, None)
+        else:
+            # Compute pivot on the tableau BEFORE the pivot
+            prow, pcol = compute_pivot_indices(t_before, tolerances)
+
+        basis_before = steps.basis(k) if self._has_bases else None
+        basis_after = steps.basis(k + 1) if self._has_bases else None
+        before_df = label_tableau(t_before, n_vars, n_cons, names_before, tolerances, basis=basis_before)
+        entering = names_before[pcol] if pcol is not None else None
         leaving = before_df.loc[prow, "VB"] if prow is not None else None
 
         if entering is not None:
             before_df = annotate_pivot(before_df, prow, entering)
 
-        after_df = label_tableau(t_after, n_vars, n_cons)
-
-        views.append(
-            {
-                "index": k + 1,
-                "before_df": before_df,
-                "after_df": after_df,
-                "entering": entering,
-                "leaving": leaving,
-                "pivot_row": prow,
-                "pivot_col_index": pcol,
-                "pivot_col_name": entering,
-                "pivot_value": t_before[prow, pcol] if prow is not None and pcol is not None else None,
-            }
-        )
-    return views
+        after_df = label_tableau(t_after, n_vars, n_cons, names_after, tolerances, basis=basis_after)
+
+        return {
+            "index": self._offset + k + 1,
+            "before_df": before_df,
+            "after_df": after_df,
+            "entering": entering,
+            "leaving": leaving,
+            "pivot_row": prow,
+            "pivot_col_index": pcol,
+            "pivot_col_name": entering,
+            "pivot_value": t_before[prow, pcol] if prow is not None and pcol is not None else None,
+            # Only recorded steps know of bound flips; a recomputed pivot without
+            # a row is an unbounded direction.
+            "bound_flip": self._pivots is not None and prow is None and pcol is not None,
+        }
@@ -0,0 +1,296 @@
+import numpy as np
+
+from factorization import BasisFactorization, sp
+from kernels import NUMPY_KERNEL
+
+
+def flip_column(tableau, col, upper):
+    """Substitute x_col = upper - x_col' in place (upper-bounding technique)."""
+    tableau[:, -1] -= upper * tableau[:, col]
+    tableau[:, col] *= -1.0
+
+
+def _complement_name(name):
+    return name[:-1] if name.endswith("'") else name + "'"
+
+
+class TableauEngine:
+    """
+    Dense tableau representation of the basis.
+
+    The last row holds the reduced costs of the current objective and minus
+    its value; every other row is one basic variable. A bounded variable
+    sitting at its upper bound is complemented (x' = u - x), so every
+    nonbasic column is at zero and its name carries a prime. Every objective
+    change, pivot and bound flip is recorded in `steps`.
+
+    `dtype` is the working precision of the tableau (and of every recorded
+    copy of it); float32 halves both. `kernel` (kernels.Kernel) runs the
+    elimination and the ratio test.
+    """
+
+    def __init__(self, model, steps, dtype=np.float64, kernel=NUMPY_KERNEL):
+        m = model.n_cons
+        self.dtype = np.dtype(dtype)
+        tableau = np.zeros((m + 1, model.n_cols + 1), dtype=self.dtype)
+        tableau[:m, :model.n_vars] = model.dense_A()
+        tableau[model.logical_rows, model.n_vars + np.arange(len(model.logical_rows))] = model.logical_signs
+        tableau[:m, -1] = model.b
+        self.tableau = tableau
+        self.basis = model.initial_basis.copy()
+        self.flipped = np.zeros(model.n_cols, dtype=bool)
+        self.upper = model.upper.copy()
+        self.columns = list(model.names)
+        self.rows = np.arange(m)
+        self.cost = np.zeros(model.n_cols)
+        self.steps = steps
+        self.kernel = kernel
+        self.iterations = 0
+
+    @property
+    def n_cols(self):
+        return self.tableau.shape[1] - 1
+
+    @property
+    def x_b(self):
+        return self.tableau[:-1, -1]
+
+    def set_objective(self, cost):
+        self.cost = cost
+        t = self.tableau
+        n = self.n_cols
+        flipped = self.flipped[:n]
+        oriented = np.where(flipped, -cost[:n], cost[:n])
+        cost_b = oriented[self.basis]
+        t[-1, :-1] = oriented - cost_b @ t[:-1, :-1]
+        # Complemented columns contribute their constant c_j u_j to the objective.
+        constant = cost[:n][flipped] @ self.upper[:n][flipped]
+        t[-1, -1] = -(cost_b @ t[:-1, -1] + constant)
+        self.steps.record_tableau(t, self.columns, self.basis)
+
+    def objective(self):
+        return -self.tableau[-1, -1]
+
+    def reduced_costs(self):
+        return self.tableau[-1, :-1]
+
+    def column(self, q):
+        return self.tableau[:-1, q]
+
+    def row(self, r):
+        return self.tableau[r, :-1]
+
+    def column_norms(self):
+        """||B^-1 a_j||^2 for every column (for steepest-edge pricing)."""
+        body = self.tableau[:-1, :-1]
+        return np.einsum("ij,ij->j", body, body)
+
+    def dot_columns(self, v):
+        """(B^-1 a_j) . v for every column."""
+        return self.tableau[:-1, :-1].T @ v
+
+    def _complement(self, j):
+        flip_column(self.tableau, j, self.upper[j])
+        self.flipped[j] = not self.flipped[j]
+        self.columns = list(self.columns)
+        self.columns[j] = _complement_name(self.columns[j])
+
+    def pivot(self, r, q, alpha, theta, leaving_at_upper=False):
+        self.iterations += 1
+        leaving = self.basis[r]
+        self.kernel.pivot(self.tableau, r, q)
+        self.basis[r] = q
+        flips, pivot_row = (), None
+        if leaving_at_upper:
+            pivot_row = self.tableau[r].copy()
+            self._complement(leaving)
+            flips = ((int(leaving), float(self.upper[leaving])),)
+        self.steps.record_pivot(self.tableau, r, q, flips, self.columns, pivot_row, self.basis)
+
+    def flip(self, q, alpha):
+        self.iterations += 1
+        self._complement(q)
+        self.steps.record_pivot(self.tableau, None, q, ((int(q), float(self.upper[q])),), self.columns, basis=self.basis)
+
+    def values(self):
+        x = np.zeros(len(self.flipped))
+        x[self.basis] = self.x_b
+        return np.where(self.flipped, self.upper - x, x)
+
+    def duals(self, model):
+        """
+        Simplex multipliers y (B^T y = c_B) of the current objective, one per
+        model row. Rows with a slack/surplus column read y off the objective
+        row (d_s = -sign * y_i); equality rows, whose artificial column is
+        gone, are solved for from the basic columns. Dropped (redundant)
+        rows get 0. A low-precision tableau only holds the objective row to
+        its own precision, so there every y is solved for in float64.
+        """
+        y = np.zeros(model.n_cons)
+        if self.dtype != np.float64:
+            B = model.basis_matrix(self.basis)
+            B = B.toarray() if sp.issparse(B) else B
+            y[self.rows] = np.linalg.solve(B[self.rows].T, self.cost[self.basis])
+            return y
+        n_slack = model.n_cols - model.n_artificial - model.n_vars
+        known = model.logical_rows[:n_slack]
+        y[known] = -model.logical_signs[:n_slack] * self.tableau[-1, model.n_vars:model.n_vars + n_slack]
+        rest = np.setdiff1d(self.rows, known)
+        if len(rest):
+            B = model.basis_matrix(self.basis)
+            residual = self.cost[self.basis] - B[known].T @ y[known]
+            y[rest] = np.linalg.lstsq(B[rest].T, residual, rcond=None)[0]
+        return y
+
+    def basis_row(self, model, r):
+        """Row r of B^-1 as multipliers of the model rows (dropped rows get 0)."""
+        B = model.basis_matrix(self.basis)
+        B = B.toarray() if sp.issparse(B) else B
+        e = np.zeros(len(self.basis))
+        e[r] = 1.0
+        y = np.zeros(model.n_cons)
+        y[self.rows] = np.linalg.solve(B[self.rows].T, e)
+        return y
+
+    def end_phase_one(self, model):
+        # Artificial columns are the trailing block: drop them, together with
+        # the rows whose artificial could not be driven out (redundant rows).
+        n_keep = model.n_cols - model.n_artificial
+        keep_rows = self.basis < n_keep
+        self.tableau = np.delete(self.tableau[np.append(keep_rows, True)], np.s_[n_keep:-1], axis=1)
+        self.basis = self.basis[keep_rows]
+        self.rows = self.rows[keep_rows]
+        self.columns = self.columns[:n_keep]
+
+    def load_basis(self, model, basis):
+        """Rewrite the initial tableau in terms of a known basis (warm start)."""
+        n_keep = model.n_cols - model.n_artificial
+        self.tableau = np.delete(self.tableau, np.s_[n_keep:-1], axis=1)
+        self.columns = self.columns[:n_keep]
+        for j in np.flatnonzero(basis.flipped):
+            self._complement(j)
+        B = self.tableau[:-1, basis.basic]
+        self.tableau[:-1] = np.linalg.solve(B, self.tableau[:-1])
+        self.basis = basis.basic.copy()
+
+
+class RevisedEngine:
+    """
+    Revised simplex representation: only the basis indices, the basic values
+    and an LU factorization of B are kept; reduced costs, columns and rows
+    are computed from the original constraint matrix on demand.
+
+    Like the tableau, it works on complemented variables: `flipped` marks
+    the columns measured from their upper bound, and reduced costs, columns,
+    rows and x_b are all given in that orientation. The factorization itself
+    is of the plain basis matrix B. `kernel` (kernels.Kernel) runs the ratio
+    test.
+    """
+
+    def __init__(self, model, refactor_every: int = 64, kernel=NUMPY_KERNEL):
+        self.model = model
+        self.n_cols = model.n_cols
+        self.upper = model.upper.copy()
+        self.basis = model.initial_basis.copy()
+        self.flipped = np.zeros(model.n_cols, dtype=bool)
+        self.x_b = model.b.copy()
+        m = model.n_cons
+        identity = sp.identity(m, format="csc") if model.sparse else np.eye(m)
+        self.factor = BasisFactorization(identity, refactor_every=refactor_every)
+        self.cost = np.zeros(model.n_cols)
+        self.kernel = kernel
+        self.iterations = 0
+
+    def _signs(self, cols):
+        return np.where(self.flipped[cols], -1.0, 1.0)
+
+    def set_objective(self, cost):
+        self.cost = cost
+
+    def objective(self):
+        return float(self.cost @ self.values())
+
+    def reduced_costs(self):
+        y = self.factor.btran(self.cost[self.basis])
+        d = (self.cost - self.model.price(y)) * self._signs(slice(None))
+        d[self.basis] = 0.0
+        return d
+
+    def column(self, q):
+        return self.factor.ftran(self.model.column(q)) * self._signs(self.basis) * self._signs(q)
+
+    def row(self, r):
+        e = np.zeros(self.model.n_cons)
+        e[r] = 1.0
+        return self.model.price(self.factor.btran(e)) * self._signs(self.basis[r]) * self._signs(slice(None))
+
+    def column_norms(self):
+        """||B^-1 a_j||^2 for every column: one ftran per column, so only on reset."""
+        norms = np.empty(self.n_cols)
+        for j in range(self.n_cols):
+            alpha = self.factor.ftran(self.model.column(j))
+            norms[j] = alpha @ alpha
+        return norms
+
+    def dot_columns(self, v):
+        """(B^-1 a_j) . v for every column, with one btran."""
+        y = self.factor.btran(v * self._signs(self.basis))
+        return self.model.price(y) * self._signs(slice(None))
+
+    def pivot(self, r, q, alpha, theta, leaving_at_upper=False):
+        self.iterations += 1
+        raw = alpha * self._signs(self.basis) * self._signs(q)
+        leaving = self.basis[r]
+        self.x_b -= theta * alpha
+        self.x_b[r] = theta
+        self.basis[r] = q
+        # The leaving variable stopped at its upper bound: measure it from there.
+        if leaving_at_upper:
+            self.flipped[leaving] = not self.flipped[leaving]
+        self.factor.update(r, raw)
+        if self.factor.needs_refactor:
+            self.factor.refactor(self.model.basis_matrix(self.basis))
+            self.refresh()
+
+    def flip(self, q, alpha):
+        self.iterations += 1
+        self.x_b -= self.upper[q] * alpha
+        self.flipped[q] = not self.flipped[q]
+
+    def refresh(self):
+        """Recompute x_b from the current factorization (e.g. after b changed)."""
+        nonbasic_upper = self.flipped.copy()
+        nonbasic_upper[self.basis] = False
+        rhs = self.model.b.copy()
+        for j in np.flatnonzero(nonbasic_upper):
+            rhs -= self.upper[j] * self.model.column(j)
+        x_b = self.factor.ftran(rhs)
+        flipped_b = self.flipped[self.basis]
+        self.x_b = np.where(flipped_b, self.upper[self.basis] - x_b, x_b)
+
+    def values(self):
+        x = np.zeros(self.n_cols)
+        x[self.basis] = self.x_b
+        return np.where(self.flipped, self.upper - x, x)
+
+    def duals(self, model):
+        """Simplex multipliers y (B^T y = c_B) of the current objective: one btran."""
+        return self.factor.btran(self.cost[self.basis])
+
+    def basis_row(self, model, r):
+        """Row r of B^-1 as multipliers of the model rows: one btran."""
+        e = np.zeros(model.n_cons)
+        e[r] = 1.0
+        return self.factor.btran(e)
+
+    def end_phase_one(self, model):
+        # Artificials left in the basis stay at zero: the driver gives them an
+        # upper bound of 0 and never lets them enter again.
+        pass
+
+    def load_basis(self, model, basis):
+        """Factorize a known basis (warm start) instead of the slack basis."""
+        self.basis = basis.basic.copy()
+        self.flipped[:len(basis.flipped)] = basis.flipped
+        self.factor.refactor(model.basis_matrix(self.basis))
+        self.refresh()
@@ -0,0 +1,70 @@
+import numpy as np
+
+try:
+    import scipy.sparse as sp
+    from scipy.linalg import lu_factor, lu_solve
+    from scipy.sparse.linalg import splu
+except ImportError:  # scipy es opcional; solo lo necesita el metodo revisado
+    sp = lu_factor = lu_solve = splu = None
+
+
+class BasisFactorization:
+    """
+    LU factorization of a basis matrix B with product-form (eta) updates.
+
+    After a pivot the new inverse is E_k ... E_1 B0^-1, so each update only
+    stores the pivot column (an eta vector) instead of refactoring B. Once
+    `refactor_every` etas have piled up, `needs_refactor` turns True and the
+    caller rebuilds the factorization from the current basis columns.
+
+    B may be a dense array or a scipy.sparse matrix (factorized with SuperLU).
+    Eta vectors keep only their nonzeros, so updates scale with fill-in
+    rather than with the number of rows.
+    """
+
+    def __init__(self, B, refactor_every: int = 64):
+        if lu_factor is None:
+            raise ImportError("El metodo simplex revisado requiere scipy (pip install scipy).")
+        self.refactor_every = refactor_every
+        self.refactor(B)
+
+    def refactor(self, B):
+        self.m = B.shape[0]
+        if sp.issparse(B):
+            self._splu = splu(sp.csc_matrix(B, dtype=float))
+            self._lu = None
+        else:
+            self._splu = None
+            self._lu = lu_factor(np.asarray(B, dtype=float))
+        self._etas = []
+
+    def _solve(self, v, trans=0):
+        if self._splu is not None:
+            return self._splu.solve(v, trans="T" if trans else "N")
+        return lu_solve(self._lu, v, trans=trans)
+
+    @property
+    def needs_refactor(self) -> bool:
+        return len(self._etas) >= self.refactor_every
+
+    def ftran(self, v) -> np.ndarray:
+        """Solve B x = v."""
+        x = self._solve(np.asarray(v, dtype=float))
+        for r, pivot, nz, vals in self._etas:
+            xr = x[r] / pivot
+            x[nz] -= xr * vals
+            x[r] = xr
+        return x
+
+    def btran(self, v) -> np.ndarray:
+        """Solve B^T y = v."""
+        y = np.array(v, dtype=float)
+        for r, pivot, nz, vals in reversed(self._etas):
+            y[r] = (y[r] - (y[nz] @ vals - y[r] * pivot)) / pivot
+        return self._solve(y, trans=1)
+
+    def update(self, r: int, alpha: np.ndarray) -> None:
+        """Record that column r of the basis was replaced; alpha = B^-1 a_q (from ftran)."""
+        alpha = np.asarray(alpha, dtype=float)
+        nz = np.flatnonzero(alpha)
+        self._etas.append((r, alpha[r], nz, alpha[nz]))
@@ -0,0 +1,149 @@
+from collections import deque
+from collections.abc import Sequence
+
+import numpy as np
+
+from engines import flip_column
+
+
+RECORD_MODES = ("all", "last", "delta", "none")
+
+
+def replay_pivot(tableau, row, col, pivot_row):
+    """Apply a recorded pivot in place, given the pivot row after normalization."""
+    tableau[row, :] = pivot_row
+    factors = tableau[:, col].copy()
+    factors[row] = 0.0
+    tableau -= np.outer(factors, pivot_row)
+
+
+class StepHistory(Sequence):
+    """
+    Tableaux recorded by Simplex(), indexable like the old list of copies.
+
+    mode="all"   keeps a copy of every tableau.
+    mode="last"  keeps only the last `size` tableaux in a ring buffer.
+    mode="delta" keeps full tableaux only where a phase starts, plus the
+                 (row, col, pivot row) and bound flips of each step,
+                 and rebuilds any tableau on demand by replaying them.
+    mode="none"  keeps nothing.
+
+    `pivots[k]` is the (row, col) pivot that turns step k into step k+1, or
+    None when step k+1 starts a new phase (new objective row, dropped
+    artificial columns). A bounded variable that jumps to its other bound
+    without a pivot is recorded as (None, col); `flips(k)` lists the
+    (col, upper) columns complemented in that step. `columns(k)` gives the
+    column names of step k, `basis(k)` the basic column of each of its rows
+    (when the solver passed it), and `offset` is the number of steps dropped
+    from the front (ring buffer), so step k is global iteration offset + k.
+    """
+
+    def __init__(self, mode: str = "all", size: int = 10):
+        if mode not in RECORD_MODES:
+            raise ValueError(f"Modo de registro desconocido: '{mode}'. Usa {', '.join(RECORD_MODES)}.")
+        if mode == "last" and size < 1:
+            raise ValueError("El buffer de iteraciones necesita al menos una posicion.")
+        self.mode = mode
+        self.size = size
+        self.offset = 0
+        ring = mode == "last"
+        self._steps = deque(maxlen=size) if ring else []
+        self._columns = deque(maxlen=size) if ring else []
+        self._bases = deque(maxlen=size) if ring else []
+        self._ops = deque(maxlen=size - 1) if ring else []
+        self._cursor = None
+
+    @property
+    def pivots(self):
+        return [op[:2] if op is not None else None for op in self._ops]
+
+    def flips(self, k):
+        op = self._ops[k]
+        return op[2] if op is not None else ()
+
+    def columns(self, k):
+        return self._columns[k]
+
+    def basis(self, k):
+        n = len(self)
+        if k < 0:
+            k += n
+        # Delta records keep the basis where a phase starts only; replay pivots from there.
+        start = k
+        while self._bases[start] is None and start > 0 and self._ops[start - 1] is not None:
+            start -= 1
+        if self._bases[start] is None:
+            return None
+        basis = self._bases[start].copy()
+        for i in range(start, k):
+            row, col, _ = self._ops[i]
+            if row is not None:
+                basis[row] = col
+        return basis
+
+    def _append(self, payload, columns, op, basis):
+        if self.mode == "last" and len(self._steps) == self.size:
+            self.offset += 1
+        if self._steps or self.offset:
+            self._ops.append(op)
+        self._steps.append(payload)
+        self._columns.append(columns)
+        keep = basis is not None and (self.mode != "delta" or op is None)
+        self._bases.append(np.array(basis) if keep else None)
+
+    def record_tableau(self, tableau, columns, basis=None):
+        """Record a tableau that does not come from a pivot (start of a phase)."""
+        if self.mode != "none":
+            self._append(tableau.copy(), columns, None, basis)
+
+    def record_pivot(self, tableau, row, col, flips=(), columns=None, pivot_row=None, basis=None):
+        """
+        Record the tableau obtained after pivoting on (row, col) and then
+        complementing the (col, upper) columns in `flips`; row is None for a
+        bound flip without pivot. `pivot_row` is the pivot row as it was
+        before those flips (defaults to the current row).
+        """
+        if self.mode == "none":
+            return
+        if self.mode != "delta":
+            payload = tableau.copy()
+        elif row is None:
+            payload = None
+        else:
+            payload = (tableau[row, :] if pivot_row is None else pivot_row).copy()
+        row = int(row) if row is not None else None
+        self._append(payload, columns or self._columns[-1], (row, int(col), tuple(flips)), basis)
+
+    def __len__(self):
+        return len(self._steps)
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return [self[i] for i in range(*k.indices(len(self)))]
+        n = len(self)
+        if k < 0:
+            k += n
+        if not 0 <= k < n:
+            raise IndexError("indice de iteracion fuera de rango")
+        if self.mode != "delta":
+            return self._steps[k]
+
+        # Replay from the closest known tableau; sequential access is O(1) per step.
+        if self._cursor is not None and self._cursor[0] <= k:
+            start, tableau = self._cursor[0], self._cursor[1].copy()
+        else:
+            start = k
+            while start > 0 and self._ops[start - 1] is not None:
+                start -= 1
+            tableau = self._steps[start].copy()
+        for i in range(start, k):
+            if self._ops[i] is None:
+                tableau = self._steps[i + 1].copy()
+                continue
+            row, col, flips = self._ops[i]
+            if row is not None:
+                replay_pivot(tableau, row, col, self._steps[i + 1])
+            for j, upper in flips:
+                flip_column(tableau, j, upper)
+        self._cursor = (k, tableau)
+        return tableau.copy()
@@ -0,0 +1,321 @@
+import numpy as np
+
+from factorization import sp
+from history import StepHistory
+from simplex import Basis, Simplex, SimplexResult, SolveError, StandardForm
+
+try:
+    from scipy.linalg import cho_factor, cho_solve
+    from scipy.sparse.csgraph import maximum_bipartite_matching
+    from scipy.sparse.linalg import splu
+except ImportError:  # scipy es opcional; solo lo necesita el metodo de punto interior
+    cho_factor = cho_solve = maximum_bipartite_matching = splu = None
+
+
+# Primal and dual regularization of the Newton systems (the dual one is
+# scaled by the largest |a_ij| squared), refinement steps that take it out
+# again, the fraction of the way to the boundary a step may go, the
+# smallest complementarity product allowed relative to their mean, and
+# the iterations without a 10% drop of the error after which the barrier
+# stops.
+REGULARIZATION = 1e-8
+REFINE_STEPS = 3
+STEP_TO_BOUNDARY = 0.995
+CENTRALITY = 1e-3
+STALL_ITERATIONS = 10
+
+# Seconds the simplex fallback may run after a failed barrier when the
+# caller gave no time_limit of its own.
+FALLBACK_TIME_LIMIT = 60.0
+
+
+def interior_point(c, A, b, sense="max", constraints=None, bounds=None, method="tableau", crossover=True, tol=1e-8, max_iter=100, time_limit=None):
+    """
+    Solve the LP with a primal-dual barrier method (Mehrotra predictor-
+    corrector), in a few dozen iterations at most whatever the model size.
+
+    Each iteration factors the regularized normal matrix A Theta A^T once
+    (dense Cholesky; sparse models use SuperLU, scipy having no sparse
+    Cholesky) and reuses it for the predictor and corrector solves, each
+    refined against the exact Newton system. Steps stop short of the
+    boundary and keep the complementarity products centered, and the
+    barrier gives up once STALL_ITERATIONS pass without progress. Finite
+    upper bounds get their own slack, so no extra rows are added.
+
+    With crossover=True the interior solution is turned into a basis
+    (columns strictly between their bounds matched to rows first, then
+    slacks, checked with a sparse LU) and handed to Simplex(basis=...,
+    method=method), which needs only a few pivots to reach a vertex; the
+    result then has the same steps, basis and tableau as a simplex solve.
+    With crossover=False the result holds the interior x and duals only.
+    `barrier_iterations`, `barrier_converged` and `fallback` are set on the
+    result either way (on the result of a raised SolveError too). If no nonsingular basis comes out of that (e.g. redundant
+    equality rows) the simplex starts from its own basis instead.
+
+    If the barrier does not converge (e.g. the model is infeasible or
+    unbounded) the solve falls back to a cold simplex solve, which reports
+    the proper status, and the result has barrier_converged=False and
+    fallback=True.
+    `time_limit` (seconds) bounds that simplex solve, FALLBACK_TIME_LIMIT
+    when it is None, so a failed barrier never turns into an unbounded
+    cold solve.
+    """
+    if cho_factor is None:
+        raise ImportError("El metodo de punto interior requiere scipy (pip install scipy).")
+    sparse = method == "sparse" or sp.issparse(A)
+    model = StandardForm(c, A, b, sense, constraints, bounds=bounds, sparse=sparse)
+    n = model.n_cols - model.n_artificial
+    M = _constraint_matrix(model, n)
+    x, y, iterations = _mehrotra(M, model.b, model.cost[:n], model.upper[:n], tol, max_iter)
+    if x is None:
+        fallback_limit = FALLBACK_TIME_LIMIT if time_limit is None else time_limit
+        try:
+            result = Simplex(c, A, b, sense, constraints, method=method, bounds=bounds, time_limit=fallback_limit)
+        except SolveError as exc:
+            _mark(exc.result, iterations, converged=False)
+            raise
+        return _mark(result, iterations, converged=False)
+
+    if not crossover:
+        x_full = np.zeros(model.n_cols)
+        x_full[:n] = x
+        duals, reduced_costs = model.dual_solution(y)
+        result = SimplexResult(
+            StepHistory("none"), model.solution(x_full), None, 0,
+            x=model.primal(x_full), duals=duals, reduced_costs=reduced_costs,
+        )
+    else:
+        basis = _crossover_basis(M, x, model.upper[:n])
+        try:
+            result = Simplex(c, A, b, sense, constraints, method=method, bounds=bounds, basis=basis, time_limit=time_limit)
+        except SolveError as exc:
+            _mark(exc.result, iterations, converged=True)
+            raise
+    return _mark(result, iterations, converged=True)
+
+
+def _mark(result, iterations, converged):
+    """Record on `result` how the barrier went and whether the simplex fallback ran."""
+    if result is not None:
+        result.barrier_iterations = iterations
+        result.barrier_converged = converged
+        result.fallback = not converged
+    return result
+
+
+def _constraint_matrix(model, n):
+    """[A | L] without the artificial columns."""
+    k = n - model.n_vars
+    rows, signs = model.logical_rows[:k], model.logical_signs[:k]
+    if model.sparse:
+        L = sp.csc_matrix((signs, (rows, np.arange(k))), shape=(model.n_cons, k))
+        return sp.hstack([model.A, L], format="csc")
+    L = np.zeros((model.n_cons, k))
+    L[rows, np.arange(k)] = signs
+    return np.hstack([model.A, L])
+
+
+def _normal_solver(M, theta, delta):
+    """
+    Factor the regularized normal matrix M diag(theta) M^T + delta I and
+    return its solve (dense Cholesky, or SuperLU for sparse M).
+    """
+    if sp.issparse(M):
+        N = (M @ sp.diags(theta) @ M.T).tocsc() + delta * sp.identity(M.shape[0], format="csc")
+        return splu(N).solve
+    N = (M * theta) @ M.T
+    N[np.diag_indices_from(N)] += delta
+    factor = cho_factor(N)
+    return lambda r: cho_solve(factor, r)
+
+
+def _kkt_solver(M, theta_inv, rho, delta):
+    """
+    Solve the reduced Newton system  -Theta^-1 dx + M^T dy = r_d,  M dx = r_p.
+
+    The factored system is the regularized one, with rho added to Theta^-1
+    (primal) and delta to the (2, 2) block (dual), which keeps the normal
+    matrix positive definite however close x gets to its bounds. A few
+    refinement steps against the unregularized system then remove both the
+    regularization and the rounding of the factorization from the step, so
+    the residuals keep falling down to tol.
+    """
+    theta = 1.0 / (theta_inv + rho)
+    solve = _normal_solver(M, theta, delta)
+
+    def regularized(r_d, r_p):
+        dy = solve(r_p + M @ (theta * r_d))
+        return theta * (M.T @ dy - r_d), dy
+
+    def kkt(r_d, r_p):
+        dx, dy = regularized(r_d, r_p)
+        scale = 1.0 + max(np.abs(r_d).max(initial=0.0), np.abs(r_p).max(initial=0.0))
+        for _ in range(REFINE_STEPS):
+            e_d = r_d + theta_inv * dx - M.T @ dy
+            e_p = r_p - M @ dx
+            if max(np.abs(e_d).max(initial=0.0), np.abs(e_p).max(initial=0.0)) <= 1e-14 * scale:
+                break
+            ex, ey = regularized(e_d, e_p)
+            dx += ex
+            dy += ey
+        return dx, dy
+
+    return kkt
+
+
+def _max_step(v, dv):
+    """Largest step in [0, 1] keeping v + step * dv >= 0."""
+    neg = dv < 0
+    return min(1.0, float(np.min(-v[neg] / dv[neg]))) if neg.any() else 1.0
+
+
+def _centered_steps(x, dx, z, dz, w, dw, v, dv, ap, ad):
+    """
+    Shorten (ap, ad) until no complementarity product falls below
+    CENTRALITY times their mean: iterates that rush to a bound much faster
+    than the rest leave the normal matrix hopelessly ill-conditioned.
+    """
+    for _ in range(10):
+        xz = np.concatenate(((x + ap * dx) * (z + ad * dz), (w + ap * dw) * (v + ad * dv)))
+        if not len(xz) or xz.min() >= CENTRALITY * xz.mean():
+            break
+        ap *= 0.9
+        ad *= 0.9
+    return ap, ad
+
+
+def _mehrotra(M_all, b, c_all, u_all, tol, max_iter):
+    """
+    Primal-dual path following for min c x s.t. M x = b, 0 <= x <= u.
+    Returns (x, y, iterations), x and y None if the barrier gave up (the
+    iteration cap, STALL_ITERATIONS without progress, diverging iterates
+    or a failed factorization); columns with u = 0 are fixed at 0.
+    """
+    free = u_all > 0
+    M, c, u = M_all[:, free], c_all[free], u_all[free]
+    m, n = M.shape
+    U = np.isfinite(u)
+    n_u = int(U.sum())
+    norm_M = max(1.0, float(abs(M).max())) if n else 1.0
+
+    try:
+        # Mehrotra's starting point: least-norm x and least-squares y, then shifted inside.
+        solve = _normal_solver(M, np.ones(n), REGULARIZATION * norm_M ** 2)
+    except (np.linalg.LinAlgError, RuntimeError):
+        return None, None, 0
+    x = M.T @ solve(b)
+    y = solve(M @ c)
+    z = c - M.T @ y
+    x += max(-1.5 * x.min(), 0.0) if n else 0.0
+    z += max(-1.5 * z.min(), 0.0) if n else 0.0
+    if n and x @ z > 0:
+        x += 0.5 * (x @ z) / z.sum()
+        z += 0.5 * (x @ z) / x.sum()
+    x = np.maximum(x, 1e-2)
+    z = np.maximum(z, 1e-2)
+    x[U] = np.clip(x[U], 0.05 * u[U], 0.95 * u[U])
+    w = u[U] - x[U]
+    v = np.full(n_u, max(1.0, float(z.mean())) if n else 1.0)
+
+    norm_b, norm_c, norm_u = 1 + np.linalg.norm(b), 1 + np.linalg.norm(c), 1 + np.linalg.norm(u[U])
+    best, best_k = np.inf, 0
+    for k in range(max_iter):
+        r_p = b - M @ x
+        r_u = u[U] - x[U] - w
+        r_d = c - M.T @ y - z
+        r_d[U] += v
+        primal_obj = c @ x
+        dual_obj = b @ y - u[U] @ v
+        error = max(
+            np.linalg.norm(r_p) / norm_b, np.linalg.norm(r_u) / norm_u, np.linalg.norm(r_d) / norm_c,
+            abs(primal_obj - dual_obj) / (1 + abs(primal_obj)),
+        )
+        if error < tol:
+            x_all = np.zeros(len(c_all))
+            x_all[free] = x
+            return x_all, y, k
+        if error < 0.9 * best:
+            best, best_k = error, k
+        elif k - best_k >= STALL_ITERATIONS:
+            break
+        if np.abs(x).max() > 1e12 or np.abs(y).max() > 1e12:
+            break
+
+        mu = (x @ z + w @ v) / (n + n_u)
+        theta_inv = z / x
+        theta_inv[U] += v / w
+        try:
+            kkt = _kkt_solver(M, theta_inv, REGULARIZATION, REGULARIZATION * norm_M ** 2)
+        except (np.linalg.LinAlgError, RuntimeError):
+            break
+
+        def newton(r_xz, r_wv):
+            rhat = r_d - r_xz / x
+            rhat[U] += (r_wv - v * r_u) / w
+            dx, dy = kkt(rhat, r_p)
+            dz = (r_xz - z * dx) / x
+            dw = r_u - dx[U]
+            dv = (r_wv - v * dw) / w
+            return dx, dy, dz, dw, dv
+
+        # Predictor (affine scaling) step, then the centering-corrector step
+        # solved with the same factorization.
+        dx, dy, dz, dw, dv = newton(-x * z, -w * v)
+        ap = min(_max_step(x, dx), _max_step(w, dw))
+        ad = min(_max_step(z, dz), _max_step(v, dv))
+        mu_aff = ((x + ap * dx) @ (z + ad * dz) + (w + ap * dw) @ (v + ad * dv)) / (n + n_u)
+        sigma = (mu_aff / mu) ** 3
+        dx, dy, dz, dw, dv = newton(sigma * mu - x * z - dx * dz, sigma * mu - w * v - dw * dv)
+
+        ap = STEP_TO_BOUNDARY * min(_max_step(x, dx), _max_step(w, dw))
+        ad = STEP_TO_BOUNDARY * min(_max_step(z, dz), _max_step(v, dv))
+        ap, ad = _centered_steps(x, dx, z, dz, w, dw, v, dv, ap, ad)
+        x += ap * dx
+        w += ap * dw
+        y += ad * dy
+        z += ad * dz
+        v += ad * dv
+    return None, None, k + 1
+
+
+def _crossover_basis(M, x, upper, tol=1e-9):
+    """
+    Pick a basis near the interior point without densifying [A | L]. The
+    columns strictly between their bounds (about m of them at a
+    nondegenerate optimum) are matched to rows first, rows left over take
+    a singleton column (their slack/surplus), and rows still uncovered
+    (equality rows) are matched to the remaining columns. A sparse LU of
+    the chosen B then checks it is nonsingular. Nonbasic columns closer to
+    their upper bound start complemented. Returns None if no nonsingular
+    basis comes out of this.
+    """
+    M = sp.csc_matrix(M)
+    m, n = M.shape
+    pattern = abs(M) > tol
+    distance = np.minimum(x, upper - x)
+    interior = distance > 1e-6 * max(1.0, float(distance.max(initial=0.0)))
+    singleton = np.diff(pattern.indptr) == 1
+    basic_in_row = np.full(m, -1)
+    for tier in (interior, singleton & ~interior, ~singleton & ~interior):
+        rows = np.flatnonzero(basic_in_row < 0)
+        cols = np.flatnonzero(tier)
+        if not len(rows):
+            break
+        if not len(cols):
+            continue
+        match = maximum_bipartite_matching(pattern[rows][:, cols].tocsr(), perm_type="column")
+        hit = match >= 0
+        basic_in_row[rows[hit]] = cols[match[hit]]
+    if (basic_in_row < 0).any():
+        return None
+    basic = np.sort(basic_in_row)
+    try:
+        pivots = np.abs(splu(M[:, basic]).U.diagonal())
+    except RuntimeError:
+        return None
+    if pivots.min() <= tol * pivots.max():
+        return None
+    nonbasic = np.ones(n, dtype=bool)
+    nonbasic[basic] = False
+    flipped = nonbasic & np.isfinite(upper) & (upper - x < x)
+    return Basis(basic, flipped)
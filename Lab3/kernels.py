@@ -0,0 +1,117 @@
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # numba es opcional; sin el se usan los kernels vectorizados de NumPy
+    numba = None
+
+
+KERNELS = ("auto", "numpy", "numba")
+
+
+def pivot_tableau(tableau, row, col):
+    """Gauss-Jordan pivot in place as one rank-1 update of every other row."""
+    tableau[row, :] /= tableau[row, col]
+    factors = tableau[:, col].copy()
+    factors[row] = 0.0
+    tableau -= np.outer(factors, tableau[row, :])
+
+
+def bounded_ratios(alpha, x_b, upper_b, pivot_tol):
+    """
+    Step at which each basic variable hits a bound: x_b / alpha when it
+    falls to 0 (alpha > pivot_tol), (u - x_b) / -alpha when it climbs to a
+    finite upper bound (alpha < -pivot_tol), inf otherwise. Returns the
+    ratios and the mask of rows limited by their upper bound.
+    """
+    ratios = np.full(alpha.shape, np.inf)
+    down = alpha > pivot_tol
+    ratios[down] = x_b[down] / alpha[down]
+    up = (alpha < -pivot_tol) & np.isfinite(upper_b)
+    ratios[up] = (upper_b[up] - x_b[up]) / -alpha[up]
+    return ratios, up
+
+
+def ratio_test(alpha, x_b, upper_b, pivot_tol):
+    """First row with the smallest bounded ratio: (row, ratio, at_upper), row -1 if none."""
+    ratios, up = bounded_ratios(alpha, x_b, upper_b, pivot_tol)
+    if not len(ratios):
+        return -1, np.inf, False
+    r = int(np.argmin(ratios))
+    if not np.isfinite(ratios[r]):
+        return -1, np.inf, False
+    return r, ratios[r], bool(up[r])
+
+
+if numba is not None:
+    # Same contracts as the NumPy versions, as explicit loops: no temporaries
+    # and no per-call dispatch, which dominates on small tableaux.
+
+    @numba.njit(cache=True)
+    def _pivot_tableau_jit(tableau, row, col):
+        n_rows, n_cols = tableau.shape
+        pivot = tableau[row, col]
+        for j in range(n_cols):
+            tableau[row, j] /= pivot
+        for i in range(n_rows):
+            if i == row:
+                continue
+            factor = tableau[i, col]
+            if factor == 0.0:
+                continue
+            for j in range(n_cols):
+                tableau[i, j] -= factor * tableau[row, j]
+
+    @numba.njit(cache=True)
+    def _ratio_test_jit(alpha, x_b, upper_b, pivot_tol):
+        best = np.inf
+        r = -1
+        at_upper = False
+        for i in range(alpha.shape[0]):
+            a = alpha[i]
+            if a > pivot_tol:
+                ratio = x_b[i] / a
+                up = False
+            elif a < -pivot_tol and np.isfinite(upper_b[i]):
+                ratio = (upper_b[i] - x_b[i]) / -a
+                up = True
+            else:
+                continue
+            if ratio < best:
+                best = ratio
+                r = i
+                at_upper = up
+        return r, best, at_upper
+
+
+class Kernel:
+    """The inner loops of a pivot: `pivot(tableau, row, col)` and `ratio_test(...)`."""
+
+    def __init__(self, name, pivot, ratio_test):
+        self.name = name
+        self.pivot = pivot
+        self.ratio_test = ratio_test
+
+    def __repr__(self):
+        return f"Kernel({self.name!r})"
+
+
+NUMPY_KERNEL = Kernel("numpy", pivot_tableau, ratio_test)
+NUMBA_KERNEL = Kernel("numba", _pivot_tableau_jit, _ratio_test_jit) if numba is not None else None
+
+
+def make_kernel(kernel="auto"):
+    """
+    Resolve a kernel name: "numba" (JIT-compiled loops, needs numba),
+    "numpy" (vectorized) or "auto" (numba when installed, else numpy).
+    Kernel instances are returned as they are.
+    """
+    if isinstance(kernel, Kernel):
+        return kernel
+    if kernel not in KERNELS:
+        raise ValueError(f"Kernel desconocido: '{kernel}'. Usa {', '.join(KERNELS)}.")
+    if kernel == "numba" and NUMBA_KERNEL is None:
+        raise ImportError("El kernel 'numba' requiere numba (pip install numba).")
+    if kernel == "numpy" or NUMBA_KERNEL is None:
+        return NUMPY_KERNEL
+    return NUMBA_KERNEL
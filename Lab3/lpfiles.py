@@ -0,0 +1,690 @@
+import gzip
+import re
+from array import array
+
+import numpy as np
+
+from factorization import sp
+from simplex import SENSES, Simplex, SolveError
+
+
+def _open(source, mode="r"):
+    """A text stream for a path (.gz paths are decompressed on the fly) or an open file."""
+    if hasattr(source, "read" if mode == "r" else "write"):
+        return _Borrowed(source)
+    path = str(source)
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class _Borrowed:
+    """Context manager around a caller's file object that leaves it open."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def __enter__(self):
+        return self.stream
+
+    def __exit__(self, *exc):
+        return False
+
+
+class LPModel:
+    """
+    An LP read from (or to be written to) a file: `c`, `A` (scipy.sparse
+    CSC), `b`, `sense`, `constraints` ("<=", ">=", "=" per row), `lower` /
+    `upper` bound arrays, `integer` (indices of integer columns), the
+    `var_names` / `row_names`, the model `name` and `offset`, a constant
+    added to the objective (not part of Simplex's Z).
+
+    `bounds` is taken as in Simplex() (one (lower, upper) pair per
+    variable, None meaning 0 / no limit) or as an (n, 2) array; unlike
+    Simplex, infinite lower bounds are kept (files may declare free
+    variables) and `solve()` substitutes them away. The `bounds` attribute
+    gives them back as pairs and `solve()` runs Simplex (revised method, A
+    kept sparse) on the model.
+    """
+
+    def __init__(self, c, A, b, sense="max", constraints=None, bounds=None, integer=None,
+                 var_names=None, row_names=None, name="LP", offset=0.0):
+        if sp is None:
+            raise ImportError("Los modelos MPS/LP requieren scipy (pip install scipy).")
+        self.c = np.asarray(c, dtype=float)
+        self.b = np.asarray(b, dtype=float)
+        n, m = len(self.c), len(self.b)
+        self.A = sp.csc_matrix(A, dtype=float, shape=(m, n))
+        if sense not in ("max", "min"):
+            raise ValueError(f"Tipo de problema desconocido: '{sense}'. Usa 'max' o 'min'.")
+        self.sense = sense
+        self.constraints = ["<="] * m if constraints is None else list(constraints)
+        if len(self.constraints) != m or any(s not in SENSES for s in self.constraints):
+            raise ValueError("Debe haber un tipo de restriccion ('<=', '>=', '=') por cada fila.")
+        self.lower, self.upper = _bound_arrays(bounds, n)
+        self.integer = np.array([] if integer is None else integer, dtype=int)
+        self.var_names = list(var_names) if var_names is not None else [f"x{j+1}" for j in range(n)]
+        self.row_names = list(row_names) if row_names is not None else [f"c{i+1}" for i in range(m)]
+        self.name = name
+        self.offset = float(offset)
+
+    @property
+    def bounds(self):
+        return [(lo, None if np.isinf(hi) else hi) for lo, hi in zip(self.lower.tolist(), self.upper.tolist())]
+
+    def solve(self, **options):
+        """
+        Simplex(**options) on this model (method="revised" unless given).
+
+        Simplex needs finite lower bounds, so a variable without one is
+        substituted first: x = u - x' (x' >= 0) when it has an upper bound u,
+        x = x+ - x- (an extra column) when it is free. x, Z, the reduced
+        costs and an unbounded ray come back in the model's own variables;
+        `basis` and `steps` stay those of the substituted model, which is
+        what solve(basis=...) on this model takes again.
+        """
+        options.setdefault("method", "revised")
+        below = np.isinf(self.lower)
+        if not below.any():
+            return Simplex(self.c, self.A, self.b, self.sense, self.constraints, bounds=self.bounds, **options)
+        c, A, b, bounds, restore = _substitute_free(self.c, self.A, self.b, self.lower, self.upper)
+        try:
+            result = Simplex(c, A, b, self.sense, self.constraints, bounds=bounds, **options)
+        except SolveError as exc:
+            if exc.result is not None:
+                restore(exc.result)
+                exc.certificate = exc.result.certificate
+            raise
+        return restore(result)
+
+
+def _substitute_free(c, A, b, lower, upper):
+    """
+    The model with every -inf lower bound removed (see LPModel.solve) and
+    the function that maps a SimplexResult of it back in place.
+    """
+    n = len(c)
+    flip = np.isinf(lower) & np.isfinite(upper)
+    split = np.flatnonzero(np.isinf(lower) & np.isinf(upper))
+    sign = np.where(flip, -1.0, 1.0)
+    # x = u - x': the column and its cost change sign and A u moves to b.
+    shift = np.where(flip, upper, 0.0)
+    c_sub = np.concatenate([sign * c, -c[split]])
+    A_sub = sp.hstack([A @ sp.diags(sign), -A[:, split]], format="csc")
+    b_sub = b - A @ shift
+    lower_sub = np.concatenate([np.where(np.isinf(lower), 0.0, lower), np.zeros(len(split))])
+    upper_sub = np.concatenate([np.where(flip, np.inf, upper), np.full(len(split), np.inf)])
+    bounds = [(lo, None if np.isinf(hi) else hi) for lo, hi in zip(lower_sub.tolist(), upper_sub.tolist())]
+    constant = float(c @ shift)
+
+    def original(v):
+        # x = shift + sign * x' - x- on the split columns.
+        x = shift + sign * v[:n]
+        x[split] -= v[n:]
+        return x
+
+    def restore(result):
+        if result.x is not None:
+            result.x = original(result.x)
+            result.solution = {"Z": result.solution["Z"] + constant}
+            for j in range(n):
+                result.solution[f"x{j+1}"] = float(result.x[j])
+            result.objective = result.solution["Z"]
+        if result.reduced_costs is not None:
+            result.reduced_costs = sign * result.reduced_costs[:n]
+        if result.status == "unbounded" and result.certificate is not None:
+            result.certificate = original(result.certificate) - shift
+        return result
+
+    return c_sub, A_sub, b_sub, bounds, restore
+
+
+def _bound_arrays(bounds, n):
+    if bounds is None:
+        return np.zeros(n), np.full(n, np.inf)
+    # None becomes NaN: a missing lower bound is 0, a missing upper one +inf.
+    pairs = np.array(bounds, dtype=float)
+    if pairs.shape != (n, 2):
+        raise ValueError("Debe haber una cota (inferior, superior) por cada variable.")
+    lower = np.where(np.isnan(pairs[:, 0]), 0.0, pairs[:, 0])
+    upper = np.where(np.isnan(pairs[:, 1]), np.inf, pairs[:, 1])
+    return lower, upper
+
+
+class _Builder:
+    """
+    Accumulates an LP while a file is streamed: names map to indices and the
+    nonzeros go to typed arrays (no per-entry Python objects), turned into
+    one CSC matrix at the end.
+    """
+
+    def __init__(self):
+        self.cols = {}
+        self.rows = {}
+        self.row_senses = []
+        self.c = array("d")
+        self.b = array("d")
+        self.lower = array("d")
+        self.upper = array("d")
+        self.nz_rows = array("q")
+        self.nz_cols = array("q")
+        self.nz_vals = array("d")
+        self.integer = set()
+
+    def col(self, name):
+        j = self.cols.get(name)
+        if j is None:
+            j = self.cols[name] = len(self.cols)
+            self.c.append(0.0)
+            self.lower.append(0.0)
+            self.upper.append(np.inf)
+        return j
+
+    def row(self, name, sense):
+        if name in self.rows:
+            raise ValueError(f"La fila '{name}' esta definida dos veces.")
+        i = self.rows[name] = len(self.rows)
+        self.row_senses.append(sense)
+        self.b.append(0.0)
+        return i
+
+    def add(self, i, j, value):
+        self.nz_rows.append(i)
+        self.nz_cols.append(j)
+        self.nz_vals.append(value)
+
+    def ranges(self, ranged):
+        """
+        Expand ranged rows {row: R} (MPS semantics) into a pair of rows:
+        the original keeps one side and a copy with the other sense is
+        appended with the other side.
+        """
+        rows = np.frombuffer(self.nz_rows, dtype=np.int64)
+        cols = np.frombuffer(self.nz_cols, dtype=np.int64)
+        vals = np.frombuffer(self.nz_vals, dtype=np.float64)
+        names = list(self.rows)
+        copy_of = np.full(len(names), -1, dtype=np.int64)
+        for i, r in ranged.items():
+            sense, rhs = self.row_senses[i], self.b[i]
+            if sense == "=":
+                lo, hi = (rhs, rhs + r) if r >= 0 else (rhs + r, rhs)
+            elif sense == "<=":
+                lo, hi = rhs - abs(r), rhs
+            else:
+                lo, hi = rhs, rhs + abs(r)
+            self.row_senses[i], self.b[i] = ">=", lo
+            copy_of[i] = self.row(names[i] + "_rng", "<=")
+            self.b[copy_of[i]] = hi
+        copied = copy_of[rows] >= 0
+        return (np.concatenate([rows, copy_of[rows[copied]]]), np.concatenate([cols, cols[copied]]),
+                np.concatenate([vals, vals[copied]]))
+
+    def model(self, sense, name, offset, ranged=None):
+        if ranged:
+            rows, cols, vals = self.ranges(ranged)
+        else:
+            rows = np.frombuffer(self.nz_rows, dtype=np.int64)
+            cols = np.frombuffer(self.nz_cols, dtype=np.int64)
+            vals = np.frombuffer(self.nz_vals, dtype=np.float64)
+        m, n = len(self.rows), len(self.cols)
+        # Repeated (row, column) entries add up, as both formats specify.
+        A = sp.csc_matrix((vals, (rows, cols)), shape=(m, n))
+        A.sum_duplicates()
+        A.eliminate_zeros()
+        bounds = np.column_stack([np.frombuffer(self.lower, dtype=np.float64), np.frombuffer(self.upper, dtype=np.float64)])
+        return LPModel(
+            np.frombuffer(self.c, dtype=np.float64).copy(), A, np.frombuffer(self.b, dtype=np.float64).copy(),
+            sense, self.row_senses, bounds, sorted(self.integer), list(self.cols), list(self.rows), name, offset,
+        )
+
+
+# --------------------------------------------------------------------- MPS
+
+_MPS_SENSES = {"L": "<=", "G": ">=", "E": "="}
+_MPS_SECTIONS = ("NAME", "OBJSENSE", "ROWS", "COLUMNS", "RHS", "RANGES", "BOUNDS", "ENDATA")
+
+
+def read_mps(source):
+    """
+    Read a (free-format) MPS file line by line into an LPModel.
+
+    Supports NAME, OBJSENSE (MAX/MIN, on its own line or after the keyword),
+    ROWS, COLUMNS (with MARKER INTORG/INTEND for integer columns), RHS
+    (a value on the objective row is minus the objective constant), RANGES
+    (a ranged row becomes a ">=" row plus a "<=" copy named "<row>_rng")
+    and BOUNDS (UP, LO, FX, FR, MI, PL, BV, LI, UI; a negative UP on a
+    column with lower bound 0 makes the lower bound -inf). Only the first
+    N row is the objective; other free rows are dropped. Names may not
+    contain spaces. `source` is a path (.gz allowed) or a text stream.
+    """
+    if sp is None:
+        raise ImportError("Los modelos MPS/LP requieren scipy (pip install scipy).")
+    build = _Builder()
+    name, sense, objective, offset = "LP", "min", None, 0.0
+    free_rows = set()
+    ranged = {}
+    section = None
+    in_integer = False
+    with _open(source) as stream:
+        for number, line in enumerate(stream, 1):
+            if not line.strip() or line.startswith("*"):
+                continue
+            fields = line.split()
+            if not line[0].isspace():
+                section = fields[0].upper()
+                if section not in _MPS_SECTIONS:
+                    raise ValueError(f"Linea {number}: seccion MPS desconocida '{fields[0]}'.")
+                if section == "NAME":
+                    name = fields[1] if len(fields) > 1 else name
+                elif section == "OBJSENSE" and len(fields) > 1:
+                    sense = _mps_sense(fields[1], number)
+                elif section == "ENDATA":
+                    break
+                continue
+            try:
+                if section == "OBJSENSE":
+                    sense = _mps_sense(fields[0], number)
+                elif section == "ROWS":
+                    kind, row = fields[0].upper(), fields[1]
+                    if kind == "N":
+                        if objective is None:
+                            objective = row
+                        else:
+                            free_rows.add(row)
+                    elif kind in _MPS_SENSES:
+                        build.row(row, _MPS_SENSES[kind])
+                    else:
+                        raise ValueError(f"tipo de fila desconocido '{fields[0]}'")
+                elif section == "COLUMNS":
+                    if len(fields) >= 3 and fields[1].strip("'").upper() == "MARKER":
+                        marker = fields[2].strip("'").upper()
+                        in_integer = marker == "INTORG"
+                        continue
+                    j = build.col(fields[0])
+                    if in_integer:
+                        build.integer.add(j)
+                    for row, value in zip(fields[1::2], fields[2::2]):
+                        if row == objective:
+                            build.c[j] += float(value)
+                        elif row not in free_rows:
+                            build.add(build.rows[row], j, float(value))
+                elif section == "RHS":
+                    # The RHS set name is optional in free MPS: pairs start at the odd field count.
+                    for row, value in zip(fields[len(fields) % 2::2], fields[len(fields) % 2 + 1::2]):
+                        if row == objective:
+                            offset = -float(value)
+                        elif row not in free_rows:
+                            build.b[build.rows[row]] = float(value)
+                elif section == "RANGES":
+                    for row, value in zip(fields[len(fields) % 2::2], fields[len(fields) % 2 + 1::2]):
+                        ranged[build.rows[row]] = float(value)
+                elif section == "BOUNDS":
+                    _mps_bound(build, fields)
+                else:
+                    raise ValueError("dato fuera de una seccion")
+            except KeyError as exc:
+                raise ValueError(f"Linea {number}: la fila o columna {exc} no esta declarada.") from None
+            except (IndexError, ValueError) as exc:
+                raise ValueError(f"Linea {number}: no se pudo leer '{line.strip()}' ({exc}).") from None
+    if objective is None:
+        raise ValueError("El archivo MPS no tiene fila objetivo (tipo N).")
+    return build.model(sense, name, offset, ranged)
+
+
+def _mps_sense(word, number):
+    word = word.upper()
+    if word in ("MAX", "MAXIMIZE"):
+        return "max"
+    if word in ("MIN", "MINIMIZE"):
+        return "min"
+    raise ValueError(f"Linea {number}: OBJSENSE desconocido '{word}'.")
+
+
+def _mps_bound(build, fields):
+    kind = fields[0].upper()
+    # The bound set name is optional: FR/MI/PL/BV take no value.
+    valueless = kind in ("FR", "MI", "PL", "BV")
+    col = fields[-1] if valueless else fields[-2]
+    j = build.col(col)
+    value = None if valueless else float(fields[-1])
+    if kind == "UP":
+        if value < 0 and build.lower[j] == 0:
+            build.lower[j] = -np.inf
+        build.upper[j] = value
+    elif kind == "LO":
+        build.lower[j] = value
+    elif kind == "FX":
+        build.lower[j] = build.upper[j] = value
+    elif kind == "FR":
+        build.lower[j], build.upper[j] = -np.inf, np.inf
+    elif kind == "MI":
+        build.lower[j] = -np.inf
+    elif kind == "PL":
+        build.upper[j] = np.inf
+    elif kind == "BV":
+        build.lower[j], build.upper[j] = 0.0, 1.0
+        build.integer.add(j)
+    elif kind in ("LI", "UI"):
+        if kind == "LI":
+            build.lower[j] = value
+        else:
+            build.upper[j] = value
+        build.integer.add(j)
+    else:
+        raise ValueError(f"tipo de cota no soportado '{fields[0]}'")
+
+
+def write_mps(model, target):
+    """
+    Write an LPModel as free-format MPS (OBJSENSE MAX for maximization,
+    integer columns between MARKER lines), streaming one column at a time.
+    """
+    A = model.A.tocsc()
+    is_int = np.zeros(len(model.c), dtype=bool)
+    is_int[model.integer] = True
+    kinds = {"<=": "L", ">=": "G", "=": "E"}
+    with _open(target, "w") as out:
+        out.write(f"NAME {model.name}\n")
+        if model.sense == "max":
+            out.write("OBJSENSE\n    MAX\n")
+        out.write("ROWS\n N obj\n")
+        for row, sense in zip(model.row_names, model.constraints):
+            out.write(f" {kinds[sense]} {row}\n")
+        out.write("COLUMNS\n")
+        in_integer = False
+        for j, col in enumerate(model.var_names):
+            if is_int[j] != in_integer:
+                in_integer = bool(is_int[j])
+                out.write(f"    MARKER 'MARKER' '{'INTORG' if in_integer else 'INTEND'}'\n")
+            lo, hi = A.indptr[j], A.indptr[j + 1]
+            if model.c[j] != 0 or lo == hi:
+                out.write(f"    {col} obj {_num(model.c[j])}\n")
+            for i, value in zip(A.indices[lo:hi].tolist(), A.data[lo:hi].tolist()):
+                out.write(f"    {col} {model.row_names[i]} {_num(value)}\n")
+        if in_integer:
+            out.write("    MARKER 'MARKER' 'INTEND'\n")
+        out.write("RHS\n")
+        if model.offset:
+            out.write(f"    rhs obj {_num(-model.offset)}\n")
+        for i in np.flatnonzero(model.b):
+            out.write(f"    rhs {model.row_names[i]} {_num(model.b[i])}\n")
+        out.write("BOUNDS\n")
+        for col, lo, hi in zip(model.var_names, model.lower.tolist(), model.upper.tolist()):
+            if lo == hi:
+                out.write(f" FX bnd {col} {_num(lo)}\n")
+                continue
+            if np.isinf(lo) and np.isinf(hi):
+                out.write(f" FR bnd {col}\n")
+                continue
+            if np.isinf(lo):
+                out.write(f" MI bnd {col}\n")
+            elif lo != 0 or hi < 0:
+                out.write(f" LO bnd {col} {_num(lo)}\n")
+            if not np.isinf(hi):
+                out.write(f" UP bnd {col} {_num(hi)}\n")
+        out.write("ENDATA\n")
+
+
+def _num(value):
+    # Shortest text that reads back as the same float.
+    return repr(float(value))
+
+
+# ---------------------------------------------------------------- CPLEX LP
+
+_LP_TOKEN = re.compile(
+    r"\s*(?:(?P<num>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?|inf(?:inity)?(?![\w.]))"
+    r"|(?P<op>[<>]=?|=[<>]?)|(?P<sign>[+-])|(?P<colon>:)|(?P<name>[^\s+\-<>=:\[\]*^]+))",
+    re.IGNORECASE,
+)
+_LP_OPS = {"<": "<=", "<=": "<=", "=<": "<=", ">": ">=", ">=": ">=", "=>": ">=", "=": "="}
+_LP_SECTIONS = (
+    ("objective", ("maximize", "maximise", "maximum", "max", "minimize", "minimise", "minimum", "min")),
+    ("constraints", ("subject to", "such that", "s.t.", "st.", "st")),
+    ("bounds", ("bounds", "bound")),
+    ("general", ("generals", "general", "gen", "integers", "integer")),
+    ("binary", ("binaries", "binary", "bin")),
+    ("end", ("end",)),
+)
+
+
+def read_lp(source):
+    """
+    Read a CPLEX LP file line by line into an LPModel.
+
+    Supports the objective (Maximize/Minimize, optional "name:" label,
+    a constant term becomes `offset`), Subject To (labeled or not, spanning
+    any number of lines, constants on the left moved to the right-hand
+    side), Bounds ("x <= 4", "-inf <= x <= 4", "x = 3", "x free", ...),
+    General/Integer and Binary sections, and "\\" comments. Quadratic
+    terms, SOS and semi-continuous sections are not supported. `source` is
+    a path (.gz allowed) or a text stream. The format has no column order:
+    columns are numbered as they first appear, so a write_lp/read_lp round
+    trip may permute them (`var_names` says how).
+    """
+    if sp is None:
+        raise ImportError("Los modelos MPS/LP requieren scipy (pip install scipy).")
+    build = _Builder()
+    sense, offset = None, 0.0
+    section = None
+    pending = []
+    number = 0
+    with _open(source) as stream:
+        for number, line in enumerate(stream, 1):
+            line = line.split("\\", 1)[0]
+            if not line.strip():
+                continue
+            found, keyword, line = _lp_section(line)
+            if found is not None:
+                if found == "objective" and sense is not None:
+                    raise ValueError(f"Linea {number}: el archivo LP tiene mas de una funcion objetivo.")
+                if section == "objective":
+                    offset = _lp_objective(build, pending, number)
+                elif pending:
+                    raise ValueError(f"Linea {number}: restriccion incompleta '{_lp_text(pending)}'.")
+                pending = []
+                section = found
+                if section == "objective":
+                    sense = "max" if keyword.startswith("max") else "min"
+                elif section == "end":
+                    break
+                if not line.strip():
+                    continue
+            if section is None:
+                raise ValueError(f"Linea {number}: falta la seccion Maximize/Minimize.")
+            tokens = _lp_tokens(line, number)
+            if section == "objective":
+                pending.extend(tokens)
+            elif section == "constraints":
+                for token in tokens:
+                    pending.append(token)
+                    if token[0] == "num" and any(kind == "op" for kind, _ in pending):
+                        _lp_constraint(build, pending, number)
+                        pending = []
+            elif section == "bounds":
+                _lp_bound(build, tokens, number)
+            else:
+                for kind, text in tokens:
+                    if kind != "name":
+                        raise ValueError(f"Linea {number}: se esperaba un nombre de variable, no '{text}'.")
+                    j = build.col(text)
+                    build.integer.add(j)
+                    if section == "binary":
+                        build.lower[j], build.upper[j] = 0.0, 1.0
+    if section == "objective":
+        offset = _lp_objective(build, pending, number)
+    elif pending:
+        raise ValueError(f"Restriccion incompleta al final del archivo: '{_lp_text(pending)}'.")
+    if sense is None:
+        raise ValueError("El archivo LP no tiene funcion objetivo (Maximize/Minimize).")
+    return build.model(sense, "LP", offset)
+
+
+def _lp_section(line):
+    """(section, keyword, rest of the line) if the line opens a section, else (None, None, line)."""
+    text = line.strip().lower()
+    for section, keywords in _LP_SECTIONS:
+        for keyword in keywords:
+            if text == keyword or (text.startswith(keyword) and text[len(keyword)] in " \t"):
+                return section, keyword, line.strip()[len(keyword):]
+    if text.startswith(("semi", "sos", "general constraints", "pwl")):
+        raise ValueError(f"Seccion LP no soportada: '{line.strip()}'.")
+    return None, None, line
+
+
+def _lp_tokens(line, number):
+    tokens = []
+    pos, end = 0, len(line.rstrip())
+    while pos < end:
+        match = _LP_TOKEN.match(line, pos)
+        if match is None or match.end() == pos:
+            raise ValueError(f"Linea {number}: no se pudo leer '{line[pos:].strip()}'.")
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+        pos = match.end()
+    return tokens
+
+
+def _lp_text(tokens):
+    return " ".join(text for _, text in tokens)
+
+
+def _lp_number(text):
+    return float("inf") if text.lower().startswith("inf") else float(text)
+
+
+def _lp_label(tokens):
+    if len(tokens) >= 2 and tokens[1][0] == "colon":
+        return tokens[0][1], tokens[2:]
+    return None, tokens
+
+
+def _lp_terms(tokens, number):
+    """Linear expression -> (list of (column name, coefficient), constant)."""
+    terms, constant = [], 0.0
+    sign, coef = 1.0, None
+    for kind, text in tokens:
+        if kind == "sign":
+            sign = -sign if text == "-" else sign
+        elif kind == "num":
+            coef = (1.0 if coef is None else coef) * _lp_number(text)
+        elif kind == "name":
+            terms.append((text, sign * (1.0 if coef is None else coef)))
+            sign, coef = 1.0, None
+        else:
+            raise ValueError(f"Linea {number}: simbolo inesperado '{text}' en '{_lp_text(tokens)}'.")
+    if coef is not None:
+        constant += sign * coef
+    return terms, constant
+
+
+def _lp_objective(build, tokens, number):
+    _, tokens = _lp_label(tokens)
+    terms, constant = _lp_terms(tokens, number)
+    for name, value in terms:
+        build.c[build.col(name)] += value
+    return constant
+
+
+def _lp_constraint(build, tokens, number):
+    label, tokens = _lp_label(tokens)
+    split = next(k for k, (kind, _) in enumerate(tokens) if kind == "op")
+    terms, constant = _lp_terms(tokens[:split], number)
+    rhs_terms, rhs = _lp_terms(tokens[split + 1:], number)
+    if rhs_terms:
+        raise ValueError(f"Linea {number}: el lado derecho de '{_lp_text(tokens)}' debe ser un numero.")
+    i = build.row(label if label is not None else f"R{len(build.rows) + 1}", _LP_OPS[tokens[split][1]])
+    build.b[i] = rhs - constant
+    for name, value in terms:
+        build.add(i, build.col(name), value)
+
+
+def _lp_bound(build, tokens, number):
+    if len(tokens) == 2 and tokens[0][0] == "name" and tokens[1][1].lower() == "free":
+        j = build.col(tokens[0][1])
+        build.lower[j], build.upper[j] = -np.inf, np.inf
+        return
+    # [value op] name [op value], with optional signs on the values.
+    parts, k = [], 0
+    while k < len(tokens):
+        kind, text = tokens[k]
+        if kind == "sign" and k + 1 < len(tokens) and tokens[k + 1][0] == "num":
+            parts.append(("num", -_lp_number(tokens[k + 1][1]) if text == "-" else _lp_number(tokens[k + 1][1])))
+            k += 2
+            continue
+        parts.append((kind, _lp_number(text) if kind == "num" else text))
+        k += 1
+    names = [p for p, (kind, _) in enumerate(parts) if kind == "name"]
+    if (len(names) != 1 or names[0] not in (0, 2) or len(parts) not in (3, 5) or (len(parts) == 5 and names[0] != 2)
+            or any(parts[p][0] != "op" for p in range(1, len(parts), 2))):
+        raise ValueError(f"Linea {number}: cota no valida '{_lp_text(tokens)}'.")
+    p = names[0]
+    j = build.col(parts[p][1])
+    if p > 0:  # value op name: the bound on x is the mirrored relation
+        _lp_set_bound(build, j, _mirror(_LP_OPS[parts[p - 1][1]]), parts[p - 2][1], number)
+    if p + 2 < len(parts):
+        _lp_set_bound(build, j, _LP_OPS[parts[p + 1][1]], parts[p + 2][1], number)
+
+
+def _mirror(op):
+    return {"<=": ">=", ">=": "<=", "=": "="}[op]
+
+
+def _lp_set_bound(build, j, op, value, number):
+    if not isinstance(value, float):
+        raise ValueError(f"Linea {number}: la cota de una variable debe ser un numero.")
+    if op == "=":
+        build.lower[j] = build.upper[j] = value
+    elif op == "<=":
+        build.upper[j] = value
+    else:
+        build.lower[j] = value
+
+
+def write_lp(model, target, terms_per_line=8):
+    """Write an LPModel in CPLEX LP format, streaming one row at a time."""
+    A = model.A.tocsr()
+    names = model.var_names
+    with _open(target, "w") as out:
+        out.write(f"\\ {model.name}\n")
+        out.write("Maximize\n" if model.sense == "max" else "Minimize\n")
+        nz = np.flatnonzero(model.c)
+        objective = _lp_expression(names, nz.tolist(), model.c[nz].tolist(), terms_per_line)
+        if model.offset:
+            objective += f" + {_num(model.offset)}" if model.offset > 0 else f" - {_num(-model.offset)}"
+        out.write(f" obj: {objective}\n")
+        out.write("Subject To\n")
+        for i, (row, sense) in enumerate(zip(model.row_names, model.constraints)):
+            lo, hi = A.indptr[i], A.indptr[i + 1]
+            expression = _lp_expression(names, A.indices[lo:hi].tolist(), A.data[lo:hi].tolist(), terms_per_line)
+            out.write(f" {row}: {expression} {sense} {_num(model.b[i])}\n")
+        out.write("Bounds\n")
+        for col, lo, hi in zip(names, model.lower.tolist(), model.upper.tolist()):
+            if lo == hi:
+                out.write(f" {col} = {_num(lo)}\n")
+            elif np.isinf(lo) and np.isinf(hi):
+                out.write(f" {col} free\n")
+            elif np.isinf(lo):
+                out.write(f" -inf <= {col} <= {_num(hi)}\n")
+            elif not np.isinf(hi):
+                out.write(f" {_num(lo)} <= {col} <= {_num(hi)}\n")
+            elif lo != 0:
+                out.write(f" {col} >= {_num(lo)}\n")
+        if len(model.integer):
+            out.write("General\n")
+            for j in model.integer.tolist():
+                out.write(f" {names[j]}\n")
+        out.write("End\n")
+
+
+def _lp_expression(names, cols, values, terms_per_line):
+    if not cols:
+        return f"0 {names[0]}" if names else "0"
+    parts = []
+    for k, (j, value) in enumerate(zip(cols, values)):
+        sign = "-" if value < 0 else "+"
+        term = f"{_num(abs(value))} {names[j]}"
+        if k == 0:
+            parts.append(f"- {term}" if value < 0 else term)
+        else:
+            parts.append(("\n   " if k % terms_per_line == 0 else "") + f" {sign} {term}")
+    return "".join(parts)
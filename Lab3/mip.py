@@ -0,0 +1,245 @@
+import heapq
+import itertools
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from engines import RevisedEngine
+from factorization import sp
+from simplex import InfeasibleError, StandardForm, UnboundedError, _parse_bounds, _final_basis, _reoptimize, _two_phase, _warm_start
+
+
+NODE_SELECTIONS = ("best-bound", "depth-first")
+
+
+class MIPResult:
+    """
+    Outcome of branch_and_bound(): `solution` (dict like Simplex's), `x`,
+    `objective`, `status` ("optimal", "infeasible", "unbounded" or
+    "node_limit"), `bound` (best objective any unexplored node could still
+    reach; equals `objective` when optimal), `nodes` (LPs solved) and
+    `iterations` (simplex pivots over all nodes).
+    """
+
+    def __init__(self, solution, x, objective, status, bound, nodes, iterations):
+        self.solution = solution
+        self.x = x
+        self.objective = objective
+        self.status = status
+        self.bound = bound
+        self.nodes = nodes
+        self.iterations = iterations
+
+
+class _NodeLP:
+    """
+    Solves the LP relaxation of a node (its bounds), warm-started from a
+    basis. One StandardForm and one revised engine are kept per process: a
+    node swaps its bounds into the model and re-optimizes from its parent's
+    basis, refactoring only when that is not the basis the engine holds.
+    """
+
+    def __init__(self, c, A, b, sense, constraints, method):
+        self.problem = (c, A, b, sense, constraints)
+        self.sparse = method == "sparse" or (sp is not None and sp.issparse(A))
+        self.model = self.engine = None
+
+    def __getstate__(self):
+        # Worker processes build their own model and engine.
+        return {"problem": self.problem, "sparse": self.sparse, "model": None, "engine": None}
+
+    def __call__(self, lower, upper, basis):
+        try:
+            try:
+                its = self._solve(lower, upper, basis)
+            except (InfeasibleError, UnboundedError):
+                raise
+            except (ValueError, np.linalg.LinAlgError, RuntimeError):
+                # The parent basis does not fit (it became singular): solve this node cold.
+                its = self._solve(lower, upper, None)
+        except InfeasibleError:
+            return "infeasible", None, None, None, 0
+        except UnboundedError:
+            return "unbounded", None, None, None, 0
+        c = self.problem[0]
+        x = self.model.primal(self.engine.values())
+        return "optimal", float(np.dot(c, x)), x, _final_basis(self.engine, self.model), its
+
+    def _solve(self, lower, upper, basis):
+        """Optimize the node in the engine; returns the pivots it took."""
+        if self.model is None or basis is None:
+            c, A, b, sense, constraints = self.problem
+            bounds = [(lo, None if math.isinf(hi) else hi) for lo, hi in zip(lower, upper)]
+            self.model = StandardForm(c, A, b, sense, constraints, bounds=bounds, sparse=self.sparse)
+            self.engine = RevisedEngine(self.model)
+            if basis is None:
+                _two_phase(self.engine, self.model)
+            else:
+                _warm_start(self.engine, self.model, basis)
+            return self.engine.iterations
+        model, engine = self.model, self.engine
+        start = engine.iterations
+        model.set_bounds(lower, upper)
+        engine.upper[:model.n_vars] = model.upper[:model.n_vars]
+        n_real = len(basis.flipped)
+        if np.array_equal(engine.basis, basis.basic) and np.array_equal(engine.flipped[:n_real], basis.flipped):
+            # Diving into a child of the last node: only x_b changes.
+            engine.refresh()
+            _reoptimize(engine, model)
+        else:
+            _warm_start(engine, model, basis)
+        return engine.iterations - start
+
+
+def _prunable(key, best_key):
+    # With no incumbent (best_key = inf) the comparison is with NaN: never prunable.
+    return key >= best_key - 1e-9 * max(1.0, abs(best_key))
+
+
+def _explore(node_lp, queue, incumbent, settings, max_nodes, stop_at=None):
+    """
+    Branch and bound over the open nodes in `queue` (a heap for best-bound,
+    a stack for depth-first), updated in place, until it is empty,
+    `max_nodes` LPs have been solved or, with `stop_at`, it holds that many
+    nodes. `incumbent` is (key, x). Returns (incumbent, nodes, iterations,
+    unbounded).
+    """
+    is_int, sign, node_selection, int_tol = settings
+    best_key, best_x = incumbent
+    # Entries: (parent key, tie-break counter, lower, upper, parent basis).
+    counter = itertools.count(max((entry[1] for entry in queue), default=0) + 1)
+    nodes = iterations = 0
+    while queue and nodes < max_nodes and (stop_at is None or len(queue) < stop_at):
+        node = heapq.heappop(queue) if node_selection == "best-bound" else queue.pop()
+        if _prunable(node[0], best_key):
+            continue
+        _, _, lo, hi, basis = node
+        node_status, objective, x, basis, its = node_lp(lo, hi, basis)
+        nodes += 1
+        iterations += its
+        if node_status == "unbounded":
+            # Bounds only tighten, so this can only be the root relaxation.
+            return (best_key, best_x), nodes, iterations, True
+        if node_status == "infeasible":
+            continue
+        key = sign * objective
+        if _prunable(key, best_key):
+            continue
+        frac = np.abs(x - np.round(x))
+        frac[~is_int] = 0.0
+        j = int(np.argmax(frac))
+        if frac[j] <= int_tol:
+            best_key, best_x = key, x
+            continue
+        # Down branch x_j <= floor, up branch x_j >= ceil; the side x_j
+        # is closer to is pushed last, so depth-first dives into it.
+        down_hi, up_lo = hi.copy(), lo.copy()
+        down_hi[j] = math.floor(x[j])
+        up_lo[j] = math.ceil(x[j])
+        children = [(lo, down_hi), (up_lo, hi)]
+        if x[j] - math.floor(x[j]) < 0.5:
+            children.reverse()
+        for child_lo, child_hi in children:
+            entry = (key, next(counter), child_lo, child_hi, basis)
+            if node_selection == "best-bound":
+                heapq.heappush(queue, entry)
+            else:
+                queue.append(entry)
+    return (best_key, best_x), nodes, iterations, False
+
+
+_worker_lp = None
+
+
+def _init_worker(node_lp):
+    global _worker_lp
+    _worker_lp = node_lp
+
+
+def _explore_in_worker(args):
+    queue, incumbent, settings, max_nodes = args
+    outcome = _explore(_worker_lp, queue, incumbent, settings, max_nodes)
+    return outcome + (queue,)
+
+
+def branch_and_bound(c, A, b, sense="max", constraints=None, bounds=None, integer=None, method="revised",
+                     node_selection="best-bound", processes=None, max_nodes=10000, int_tol=1e-6):
+    """
+    Solve the LP with integrality on the variables listed in `integer`
+    (0-based indices; None means all of them) by LP-based branch and bound.
+
+    Each node is the LP relaxation with tightened bounds, solved on one
+    model and revised engine per process (method="revised" or "sparse"):
+    its bounds are swapped in and it is re-optimized from its parent's
+    optimal basis, so a child usually needs only a few dual simplex pivots
+    and no refactorization when it follows its parent. Branching is on the
+    most fractional variable. node_selection="best-bound" always expands
+    the node with the best LP bound (fewest nodes); "depth-first" dives
+    into the most recent child (finds incumbents early, small queue).
+
+    With processes > 1 the tree is first expanded here until there is an
+    open node per worker; the open nodes are then dealt out and each worker
+    process searches its share of subtrees on its own model and engine,
+    pruning against the incumbent known when they were handed out (workers
+    do not share incumbents while they run). max_nodes is split among them.
+    """
+    if node_selection not in NODE_SELECTIONS:
+        raise ValueError(f"Seleccion de nodos desconocida: '{node_selection}'. Usa {', '.join(NODE_SELECTIONS)}.")
+    if sense not in ("max", "min"):
+        raise ValueError(f"Tipo de problema desconocido: '{sense}'. Usa 'max' o 'min'.")
+    if method not in ("revised", "sparse"):
+        raise ValueError("branch_and_bound usa el metodo revisado: method='revised' o 'sparse'.")
+    n = len(c)
+    lower, upper = _parse_bounds(bounds, n)
+    is_int = np.zeros(n, dtype=bool)
+    is_int[list(range(n)) if integer is None else list(integer)] = True
+    # Integer variables can start from integral bounds.
+    lower[is_int] = np.ceil(lower[is_int] - int_tol)
+    upper[is_int] = np.floor(upper[is_int] + int_tol)
+    sign = -1.0 if sense == "max" else 1.0  # nodes are ranked by sign * objective (smaller is better)
+
+    node_lp = _NodeLP(c, A, b, sense, constraints, method)
+    settings = (is_int, sign, node_selection, int_tol)
+    queue = [(-math.inf, 0, lower, upper, None)]
+    parallel = processes is not None and processes > 1
+    incumbent, nodes, iterations, unbounded = _explore(
+        node_lp, queue, (math.inf, None), settings, max_nodes, stop_at=processes if parallel else None
+    )
+
+    if parallel and queue and not unbounded and nodes < max_nodes:
+        # Deal the open nodes out best first, so every worker gets good ones.
+        queue.sort(key=lambda entry: entry[:2])
+        shares = [queue[k::processes] for k in range(processes) if queue[k::processes]]
+        budget = max(1, (max_nodes - nodes) // len(shares))
+        jobs = [(share, incumbent, settings, budget) for share in shares]
+        with ProcessPoolExecutor(len(shares), initializer=_init_worker, initargs=(node_lp,)) as pool:
+            outcomes = list(pool.map(_explore_in_worker, jobs))
+        queue = []
+        for share_incumbent, share_nodes, share_iterations, share_unbounded, rest in outcomes:
+            nodes += share_nodes
+            iterations += share_iterations
+            unbounded |= share_unbounded
+            if share_incumbent[0] < incumbent[0]:
+                incumbent = share_incumbent
+            queue.extend(rest)
+
+    best_key, best_x = incumbent
+    open_keys = [entry[0] for entry in queue if not _prunable(entry[0], best_key)]
+    if unbounded:
+        status = "unbounded"
+    else:
+        status = "node_limit" if open_keys else ("optimal" if best_x is not None else "infeasible")
+    if status != "optimal":
+        bound = sign * min(open_keys + [best_key]) if status == "node_limit" else None
+    else:
+        bound = sign * best_key
+
+    if best_x is None:
+        return MIPResult(None, None, None, status, bound, nodes, iterations)
+    x = np.where(is_int, np.round(best_x), best_x)
+    objective = float(np.dot(c, x))
+    solution = {"Z": objective}
+    for k in range(n):
+        solution[f"x{k+1}"] = float(x[k])
+    return MIPResult(solution, x, objective, status, bound, nodes, iterations)
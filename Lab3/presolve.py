@@ -0,0 +1,432 @@
+import numpy as np
+
+from factorization import sp
+from simplex import SENSES, InfeasibleError, Simplex, SimplexResult, SolveError, UnboundedError, _parse_bounds
+
+
+def presolve(c, A, b, sense="max", constraints=None, bounds=None, tol=1e-9):
+    """
+    Shrink an LP before it reaches Simplex().
+
+    Repeats, until nothing changes:
+      - fixed variables (lower == upper) are substituted into b;
+      - empty rows are checked and dropped;
+      - singleton rows a x_j (<=, >=, =) b become bounds on x_j;
+      - rows that can never bind given the bounds (row activity) are
+        dropped, and rows that can never be satisfied are reported;
+      - parallel rows (one a positive/negative multiple of another) keep
+        only the tightest "<=" and ">=" side, or their "=" row;
+      - dominated columns, where moving x_j off a bound can only hurt the
+        objective and the rows, are fixed at that bound; a column in no
+        row that improves the objective without limit is set aside as a
+        pending ray (the model is unbounded if the rest is feasible);
+      - singleton columns with zero cost and no upper bound (explicit
+        slacks) are eliminated: an "=" row becomes the inequality they
+        leave behind, and an inequality they can always satisfy is dropped.
+
+    A may be dense or scipy.sparse: the reductions only visit its nonzeros
+    (kept both by rows and by columns) and the reduced A keeps the format.
+    Raises InfeasibleError when a reduction proves it; unboundedness is
+    only reported by postsolve, once the reduced model is known feasible.
+    The reduced model is in the returned PresolvedModel (c, A, b,
+    constraints, bounds, ready for Simplex) and `postsolve(result)` maps a
+    Simplex result of it back to the original variables and rows.
+    """
+    if sense not in ("max", "min"):
+        raise ValueError(f"Tipo de problema desconocido: '{sense}'. Usa 'max' o 'min'.")
+    c = np.array(c, dtype=float)
+    n = len(c)
+    b = np.array(b, dtype=float)
+    m = len(b)
+    A = _Matrix(A, m, n)
+    senses = ["<="] * m if constraints is None else list(constraints)
+    if len(senses) != m or any(s not in SENSES for s in senses):
+        raise ValueError("Debe haber un tipo de restriccion ('<=', '>=', '=') por cada fila.")
+    lower, upper = _parse_bounds(bounds, n)
+    return _Presolver(c, A, b, sense, senses, lower, upper, tol).run()
+
+
+def solve_presolved(c, A, b, sense="max", constraints=None, bounds=None, **options):
+    """
+    Presolve, run Simplex(**options) on what is left and postsolve the
+    result. With raise_on_failure=False a failure proved by presolve comes
+    back as a result with its status, like one found by Simplex.
+    """
+    raise_on_failure = options.get("raise_on_failure", True)
+    try:
+        reduced = presolve(c, A, b, sense, constraints, bounds)
+    except SolveError as exc:
+        if raise_on_failure:
+            raise
+        return SimplexResult([], None, None, 0, status=exc.status)
+    result = None
+    if len(reduced.c):
+        result = Simplex(reduced.c, reduced.A, reduced.b, sense, reduced.constraints, bounds=reduced.bounds, **options)
+    result = reduced.postsolve(result)
+    if result.status == "unbounded" and raise_on_failure:
+        # Only a pending ray gets here: Simplex raises on its own failures.
+        exc = UnboundedError(_ray_message(reduced.rays[0]), result.certificate)
+        exc.result = result
+        raise exc
+    return result
+
+
+def _ray_message(j):
+    return f"El problema es no acotado: x{j+1} mejora la funcion objetivo sin limite."
+
+
+class _Matrix:
+    """
+    The nonzeros of A by rows (CSR arrays) and by columns (CSC arrays),
+    built from a dense array or a scipy.sparse matrix without densifying it,
+    plus the products presolve and postsolve need.
+    """
+
+    def __init__(self, A, m, n):
+        if sp is not None and sp.issparse(A):
+            if A.shape != (m, n):
+                raise ValueError("La matriz de restricciones debe tener una fila por restriccion y una columna por variable.")
+            csr = sp.csr_matrix(A, dtype=float)
+            csr.sum_duplicates()
+            csc = csr.tocsc()
+            csc.sum_duplicates()
+            self.source = csr
+            self.row_ptr, self.row_idx, self.row_val = csr.indptr, csr.indices, csr.data
+            self.col_ptr, self.col_idx, self.col_val = csc.indptr, csc.indices, csc.data
+        else:
+            dense = np.array(A, dtype=float).reshape(m, n)
+            self.source = dense
+            rows, cols = np.nonzero(dense)
+            self.row_ptr = np.searchsorted(rows, np.arange(m + 1))
+            self.row_idx, self.row_val = cols, dense[rows, cols]
+            cols, rows = np.nonzero(dense.T)
+            self.col_ptr = np.searchsorted(cols, np.arange(n + 1))
+            self.col_idx, self.col_val = rows, dense[rows, cols]
+        self.shape = (m, n)
+        # Row of every CSR entry and column of every CSC entry, for bincount sums.
+        self.row_of = np.repeat(np.arange(m), np.diff(self.row_ptr))
+        self.col_of = np.repeat(np.arange(n), np.diff(self.col_ptr))
+
+    def row(self, i):
+        span = slice(self.row_ptr[i], self.row_ptr[i + 1])
+        return self.row_idx[span], self.row_val[span]
+
+    def col(self, j):
+        span = slice(self.col_ptr[j], self.col_ptr[j + 1])
+        return self.col_idx[span], self.col_val[span]
+
+    def entry(self, i, j):
+        rows, values = self.col(j)
+        return float(values[rows == i].sum())
+
+    def dot(self, x):
+        """A @ x."""
+        return np.bincount(self.row_of, self.row_val * x[self.row_idx], minlength=self.shape[0])
+
+    def tdot(self, y):
+        """A.T @ y."""
+        return np.bincount(self.col_of, self.col_val * y[self.col_idx], minlength=self.shape[1])
+
+    def submatrix(self, rows, cols):
+        """A[rows][:, cols] in the format A came in."""
+        if isinstance(self.source, np.ndarray):
+            return self.source[np.ix_(rows, cols)]
+        return self.source[rows][:, cols]
+
+
+class PresolvedModel:
+    """
+    The reduced LP (`c`, `A`, `b`, `constraints`, `bounds`, `sense`) plus
+    what postsolve needs: `rows` / `cols` are the original indices that
+    survived and `fixed` holds the value of every variable fixed by the
+    reductions (NaN for kept ones and for eliminated singleton columns,
+    whose value postsolve recovers from their row). `rays` lists the
+    variables in no row that improve the objective without limit: they sit
+    at their lower bound in `fixed` and make the model unbounded as soon as
+    the reduced one is feasible.
+    """
+
+    def __init__(self, original, rows, cols, fixed, lower, upper, constraints, b, sources, singletons, rays):
+        c, A, _, sense, _ = original
+        self._original = original
+        self.rows = rows
+        self.cols = cols
+        self.fixed = fixed
+        self.sense = sense
+        self.c = c[cols]
+        self.A = A.submatrix(rows, cols)
+        # Fixed variables have already been moved to the right-hand side.
+        self.b = b[rows]
+        self.constraints = [str(constraints[i]) for i in rows]
+        self.bounds = [(lower[j], None if np.isinf(upper[j]) else upper[j]) for j in cols]
+        self._sources = sources
+        self._singletons = singletons
+        self.rays = rays
+
+    def postsolve(self, result):
+        """
+        Expand a Simplex result of the reduced model to the original one.
+        A result without an optimum keeps its status and has its certificate
+        (Farkas multipliers per row, or an improving ray per variable) spread
+        over the original rows / variables, zero on the removed ones.
+        A feasible reduced model (an optimal result, or None when presolve
+        removed every column) with pending rays is unbounded along the first.
+        """
+        c, A, b, sense, senses = self._original
+        if self.rays and (result is None or result.status == "optimal"):
+            ray = np.zeros(len(c))
+            ray[self.rays[0]] = 1.0
+            steps, iterations = (result.steps, result.iterations) if result is not None else ([], 0)
+            return SimplexResult(steps, None, None, iterations, status="unbounded", certificate=ray)
+        if result is not None and result.status != "optimal":
+            certificate = None
+            if result.certificate is not None and result.status == "infeasible":
+                certificate = np.zeros(len(b))
+                certificate[self.rows] = result.certificate
+            elif result.certificate is not None and result.status == "unbounded":
+                certificate = np.zeros(len(c))
+                certificate[self.cols] = result.certificate
+            return SimplexResult(result.steps, None, None, result.iterations, status=result.status, certificate=certificate)
+        x = self.fixed.copy()
+        y = np.zeros(len(b))
+        steps, basis, iterations = [], None, 0
+        if result is not None:
+            x[self.cols] = result.x
+            y[self.rows] = result.duals
+            steps, iterations = result.steps, result.iterations
+
+        # A singleton column takes whatever its row leaves over; newest first,
+        # so every other column of the row is known by then.
+        for j, i, rhs, lower, a, cols, values in reversed(self._singletons):
+            x[j] = max(lower, (rhs - values @ x[cols]) / a)
+
+        # A bound that came from a singleton row and is active carries that
+        # row's dual: undo the reductions newest first.
+        improving_up = 1.0 if sense == "max" else -1.0
+        for j, side, i, bound in reversed(self._sources):
+            rows, values = A.col(j)
+            rc = c[j] - values @ y[rows]
+            up = improving_up * rc > 0
+            if up == (side == "upper") and abs(x[j] - bound) <= 1e-9 * max(1.0, abs(bound)):
+                y[i] += rc / A.entry(i, j)
+
+        solution = {"Z": float(c @ x)}
+        for j in range(len(c)):
+            solution[f"x{j+1}"] = float(x[j])
+        return SimplexResult(steps, solution, basis, iterations, x=x, duals=y, reduced_costs=c - A.tdot(y))
+
+
+class _Presolver:
+    def __init__(self, c, A, b, sense, senses, lower, upper, tol):
+        self.original = (c, A, b, sense, senses)
+        self.A = A
+        self.b = b.copy()
+        self.senses = np.array(senses, dtype="<U2")
+        self.cost = -c if sense == "max" else c.copy()
+        self.lower = lower
+        self.upper = upper
+        self.tol = tol
+        self.row_alive = np.ones(len(b), dtype=bool)
+        self.col_alive = np.ones(len(c), dtype=bool)
+        self.fixed = np.full(len(c), np.nan)
+        # (column, "lower"/"upper", row, bound) for bounds taken from singleton rows.
+        self.sources = []
+        # (column, row, rhs, lower, coefficient, other columns, their coefficients)
+        # for eliminated singleton columns.
+        self.singletons = []
+        # Columns in no row that improve the objective without limit.
+        self.rays = []
+
+    def run(self):
+        changed = True
+        while changed:
+            changed = self._fix_columns()
+            changed |= self._singleton_rows()
+            changed |= self._row_activity()
+            changed |= self._parallel_rows()
+            changed |= self._dominated_columns()
+            changed |= self._singleton_columns()
+        rows = np.flatnonzero(self.row_alive)
+        cols = np.flatnonzero(self.col_alive)
+        return PresolvedModel(
+            self.original, rows, cols, self.fixed, self.lower, self.upper, self.senses, self.b, self.sources,
+            self.singletons, self.rays,
+        )
+
+    def _row_entries(self):
+        """Mask of the CSR entries in live rows and columns that are not (numerically) zero."""
+        A = self.A
+        return self.row_alive[A.row_of] & self.col_alive[A.row_idx] & (np.abs(A.row_val) > self.tol)
+
+    def _col_entries(self):
+        """Mask of the CSC entries in live rows and columns that are not (numerically) zero."""
+        A = self.A
+        return self.col_alive[A.col_of] & self.row_alive[A.col_idx] & (np.abs(A.col_val) > self.tol)
+
+    def _fix(self, cols, values):
+        self.fixed[cols] = values
+        self.col_alive[cols] = False
+        x = np.zeros(len(self.fixed))
+        x[cols] = values
+        self.b -= self.A.dot(x)
+
+    def _fix_columns(self):
+        fixed = self.col_alive & (self.upper - self.lower <= self.tol)
+        if not fixed.any():
+            return False
+        self._fix(np.flatnonzero(fixed), self.lower[fixed])
+        return True
+
+    def _tighten(self, j, side, bound, row):
+        if side == "upper" and bound < self.upper[j] - self.tol:
+            self.upper[j] = bound
+        elif side == "lower" and bound > self.lower[j] + self.tol:
+            self.lower[j] = bound
+        else:
+            return
+        self.sources.append((j, side, row, bound))
+        if self.lower[j] > self.upper[j] + self.tol * max(1.0, abs(bound)):
+            raise InfeasibleError(f"El problema no tiene solucion factible: las cotas de x{j+1} se contradicen.")
+        self.upper[j] = max(self.upper[j], self.lower[j])
+
+    def _singleton_rows(self):
+        A = self.A
+        live = self._row_entries()
+        counts = np.bincount(A.row_of[live], minlength=len(self.b))
+        # Tightening bounds leaves the columns alive, so the counts stay valid.
+        for e in np.flatnonzero(live & (counts[A.row_of] == 1)):
+            i, j, a = int(A.row_of[e]), int(A.row_idx[e]), A.row_val[e]
+            s, rhs = self.senses[i], self.b[i]
+            if s != "=":
+                # a x <= rhs bounds x from above when a > 0 (from below when a < 0).
+                side = "upper" if (s == "<=") == (a > 0) else "lower"
+                self._tighten(j, side, rhs / a, i)
+            else:
+                self._tighten(j, "upper", rhs / a, i)
+                self._tighten(j, "lower", rhs / a, i)
+            self.row_alive[i] = False
+        return bool((counts == 1).any())
+
+    def _row_activity(self):
+        """Smallest and largest value of every row over the current bounds decide which rows stay."""
+        A, tol, b = self.A, self.tol, self.b
+        live = self._row_entries()
+        rows, cols, a = A.row_of[live], A.row_idx[live], A.row_val[live]
+        pos = a > 0
+        # Lower bounds are finite, so low never reaches +inf and high never -inf.
+        low = np.bincount(rows, a * np.where(pos, self.lower[cols], self.upper[cols]), minlength=len(b))
+        high = np.bincount(rows, a * np.where(pos, self.upper[cols], self.lower[cols]), minlength=len(b))
+        le, ge = self.senses == "<=", self.senses == ">="
+        slack = tol * np.maximum(1.0, np.abs(b))
+        broken = self.row_alive & ((~ge & (low > b + slack)) | (~le & (high < b - slack)))
+        if broken.any():
+            i = np.flatnonzero(broken)[0]
+            raise InfeasibleError(f"El problema no tiene solucion factible: la restriccion {i+1} no se puede cumplir.")
+        # Never binding (this also covers empty rows).
+        idle = self.row_alive & (
+            (le & (high <= b + slack)) | (ge & (low >= b - slack)) | (~le & ~ge & (high - low <= slack))
+        )
+        self.row_alive[idle] = False
+        return bool(idle.any())
+
+    def _parallel_rows(self):
+        A = self.A
+        live = self._row_entries()
+        rows, cols, values = A.row_of[live], A.row_idx[live], A.row_val[live]
+        counts = np.bincount(rows, minlength=len(self.b))
+        ends = np.cumsum(counts)
+        starts = ends - counts
+        # Each row scaled by its first nonzero: parallel rows get equal bytes.
+        scale = np.ones(len(self.b))
+        scale[counts > 0] = values[starts[counts > 0]]
+        normalized = np.round(values / scale[rows], 9)
+        # Equal rows get equal fingerprints (same terms summed in the same
+        # order), so only rows sharing one need their bytes compared.
+        weights = np.random.default_rng(0).uniform(1.0, 2.0, len(self.cost))
+        fingerprint = np.bincount(rows, normalized * weights[cols], minlength=len(self.b))
+        candidates = self.row_alive & (counts >= 2)
+        _, which, seen = np.unique(fingerprint[candidates], return_inverse=True, return_counts=True)
+        candidates[candidates] = seen[which] > 1
+        shape = normalized.tobytes()
+        pattern = cols.tobytes()
+        width, index_width = 8, cols.itemsize
+        # Plain lists: the loop below touches one scalar of each per row.
+        starts, ends, senses = starts.tolist(), ends.tolist(), self.senses.tolist()
+        rhs, scale = (self.b / scale).tolist(), scale.tolist()
+        groups = {}
+        for i in np.flatnonzero(candidates).tolist():
+            p, q = starts[i], ends[i]
+            key = shape[p * width : q * width] + pattern[p * index_width : q * index_width]
+            s = senses[i]
+            if scale[i] < 0 and s != "=":
+                s = "<=" if s == ">=" else ">="
+            groups.setdefault(key, []).append((i, s, rhs[i]))
+
+        changed = False
+        for rows in groups.values():
+            if len(rows) < 2:
+                continue
+            ups = [(rhs, i) for i, s, rhs in rows if s in ("<=", "=")]
+            los = [(rhs, i) for i, s, rhs in rows if s in (">=", "=")]
+            hi, lo = min(ups, default=(np.inf, None)), max(los, default=(-np.inf, None))
+            if lo[0] > hi[0] + self.tol * max(1.0, abs(hi[0])):
+                raise InfeasibleError(f"El problema no tiene solucion factible: las restricciones {lo[1]+1} y {hi[1]+1} se contradicen.")
+            equalities = [i for i, s, _ in rows if s == "="]
+            keep = {equalities[0]} if equalities else {i for _, i in (hi, lo) if i is not None}
+            for i, _, _ in rows:
+                if i not in keep:
+                    self.row_alive[i] = False
+                    changed = True
+        return changed
+
+    def _dominated_columns(self):
+        A, n = self.A, len(self.cost)
+        live = self._col_entries()
+        cols, a = A.col_of[live], A.col_val[live]
+        senses = self.senses[A.col_idx[live]]
+        used = np.bincount(cols, minlength=n)
+        equalities = np.bincount(cols, senses == "=", minlength=n)
+        # Rows that increasing x_j tightens: a > 0 in a "<=" row, a < 0 in a ">=" row.
+        tightens = np.bincount(cols, np.where(senses == "<=", a > 0, (senses == ">=") & (a < 0)), minlength=n)
+        free = self.col_alive & (equalities == 0)
+        down = free & (self.cost >= 0) & (tightens == used)
+        up = free & ~down & (self.cost <= 0) & (tightens == 0)
+        finite = np.isfinite(self.upper)
+        # Whether such a column makes the model unbounded depends on the other
+        # rows being feasible, which only the reduced solve can tell.
+        rays = up & ~finite & (self.cost < 0) & (used == 0)
+        self.rays.extend(np.flatnonzero(rays).tolist())
+        up &= finite
+        if not (down | up | rays).any():
+            return False
+        cols = np.flatnonzero(down | up | rays)
+        self._fix(cols, np.where(up, self.upper, self.lower)[cols])
+        return True
+
+    def _singleton_columns(self):
+        A, tol = self.A, self.tol
+        live = self._col_entries()
+        counts = np.bincount(A.col_of[live], minlength=len(self.cost))
+        slacks = self.col_alive & (counts == 1) & (np.abs(self.cost) <= tol) & np.isinf(self.upper)
+        changed = False
+        for e in np.flatnonzero(live & slacks[A.col_of]):
+            j, i, a = int(A.col_of[e]), int(A.col_idx[e]), A.col_val[e]
+            if not self.row_alive[i]:
+                continue
+            s = self.senses[i]
+            if s == "=":
+                # a x_j = rhs - rest with x_j >= lower leaves one inequality on the rest.
+                self.senses[i] = "<=" if a > 0 else ">="
+            elif (s == "<=") != (a < 0):
+                # Raising x_j only tightens the row: a dominated column, fixed there.
+                continue
+            else:
+                # x_j can always be raised until the row holds.
+                self.row_alive[i] = False
+            cols, values = A.row(i)
+            others = self.col_alive[cols] & (cols != j)
+            self.singletons.append((j, i, self.b[i], self.lower[j], a, cols[others], values[others]))
+            self.col_alive[j] = False
+            self.b[i] -= a * self.lower[j]
+            changed = True
+        return changed
@@ -0,0 +1,59 @@
+import numpy as np
+
+from factorization import sp
+
+
+SCALINGS = ("geometric", "equilibrium")
+
+
+def _power_of_two(factors):
+    # Powers of two scale without rounding error.
+    return np.exp2(np.round(np.log2(factors)))
+
+
+def _extremes(index, values, size):
+    high = np.zeros(size)
+    low = np.full(size, np.inf)
+    np.maximum.at(high, index, values)
+    np.minimum.at(low, index, values)
+    empty = high == 0
+    high[empty] = low[empty] = 1.0
+    return high, low
+
+
+def scale_factors(A, method="geometric", passes=4):
+    """
+    Row and column factors r, s (powers of two) so that diag(r) A diag(s)
+    has entries close to 1 in magnitude.
+
+    method="geometric" alternates `passes` rounds of dividing every row and
+    then every column by the geometric mean of its largest and smallest
+    nonzero, then equilibrates; method="equilibrium" only equilibrates
+    (largest entry of every row, then of every column, becomes 1).
+    Empty rows and columns keep factor 1. A may be dense or scipy.sparse.
+    """
+    if method not in SCALINGS:
+        raise ValueError(f"Escalamiento desconocido: '{method}'. Usa {', '.join(SCALINGS)}.")
+    m, n = A.shape
+    if sp is not None and sp.issparse(A):
+        coo = A.tocoo()
+        rows, cols, vals = coo.row, coo.col, np.abs(coo.data)
+    else:
+        rows, cols = np.nonzero(A)
+        vals = np.abs(np.asarray(A)[rows, cols])
+    keep = vals > 0
+    rows, cols, vals = rows[keep], cols[keep], vals[keep]
+
+    r = np.ones(m)
+    s = np.ones(n)
+    if method == "geometric":
+        for _ in range(passes):
+            high, low = _extremes(rows, vals * r[rows] * s[cols], m)
+            r /= np.sqrt(high * low)
+            high, low = _extremes(cols, vals * r[rows] * s[cols], n)
+            s /= np.sqrt(high * low)
+    high, _ = _extremes(rows, vals * r[rows] * s[cols], m)
+    r /= high
+    high, _ = _extremes(cols, vals * r[rows] * s[cols], n)
+    s /= high
+    return _power_of_two(r), _power_of_two(s)
@@ -0,0 +1,127 @@
+import numpy as np
+
+from engines import RevisedEngine
+from simplex import Simplex, StandardForm
+
+
+class SensitivityReport:
+    """
+    Sensitivity of an optimal basis, in the terms of the original model:
+
+      shadow_prices  dZ/db_i per constraint;
+      reduced_costs  c_j - y^T A_j per variable;
+      c_range        (n, 2) interval of each c_j over which the basis stays
+                     optimal (the other coefficients fixed);
+      b_range        (m, 2) interval of each b_i over which the basis stays
+                     feasible, so the shadow prices remain valid.
+
+    `c_increase` / `c_decrease` and `b_increase` / `b_decrease` are the
+    allowable changes (np.inf when unlimited).
+    """
+
+    def __init__(self, x, shadow_prices, reduced_costs, c, c_range, b, b_range):
+        self.x = x
+        self.shadow_prices = shadow_prices
+        self.reduced_costs = reduced_costs
+        self.c = c
+        self.c_range = c_range
+        self.b = b
+        self.b_range = b_range
+
+    @property
+    def c_increase(self):
+        return self.c_range[:, 1] - self.c
+
+    @property
+    def c_decrease(self):
+        return self.c - self.c_range[:, 0]
+
+    @property
+    def b_increase(self):
+        return self.b_range[:, 1] - self.b
+
+    @property
+    def b_decrease(self):
+        return self.b - self.b_range[:, 0]
+
+
+def sensitivity(c, A, b, sense="max", constraints=None, bounds=None, result=None, tol=1e-9):
+    """
+    Shadow prices, reduced costs and ranging for every c_j and b_i, all
+    from one factorization of the optimal basis instead of re-solving.
+
+    `result` is a SimplexResult of this model (it is solved with the
+    revised method when omitted); its basis must be free of artificials.
+    """
+    if result is None:
+        result = Simplex(c, A, b, sense, constraints, method="revised", bounds=bounds)
+    if result.basis is None:
+        raise ValueError("El analisis de sensibilidad necesita una base optima sin artificiales (hay filas redundantes).")
+    model = StandardForm(c, A, b, sense, constraints, bounds=bounds)
+    engine = RevisedEngine(model)
+    engine.load_basis(model, result.basis)
+    engine.set_objective(model.cost)
+
+    c = model.c
+    b = np.array(b, dtype=float)
+    cost_lo, cost_hi = _cost_ranges(engine, model, tol)
+    # Min-form cost ranges back to the original objective (cost = -c when maximizing).
+    if model.sense == "max":
+        c_range = np.column_stack([c - cost_hi, c - cost_lo])
+    else:
+        c_range = np.column_stack([c + cost_lo, c + cost_hi])
+
+    rhs_lo, rhs_hi = _rhs_ranges(engine, model, tol)
+    # Normalized row i is row_sign_i times the original one.
+    flipped = model.row_sign < 0
+    rhs_lo[flipped], rhs_hi[flipped] = -rhs_hi[flipped], -rhs_lo[flipped]
+    b_range = np.column_stack([b + rhs_lo, b + rhs_hi])
+
+    return SensitivityReport(result.x, result.duals, result.reduced_costs, c, c_range, b, b_range)
+
+
+def _cost_ranges(engine, model, tol):
+    """Allowed change [lo, hi] of each structural min-form cost."""
+    n = model.n_vars
+    d = engine.reduced_costs()
+    signs = np.where(engine.flipped, -1.0, 1.0)
+    nonbasic = ~model.artificial.copy()
+    nonbasic[engine.basis] = False
+    lo = np.empty(n)
+    hi = np.empty(n)
+    rows = {int(j): r for r, j in enumerate(engine.basis)}
+    for j in range(n):
+        if j in rows:
+            # Changing a basic cost by delta moves every nonbasic d_k by
+            # -delta * alpha_rk; each must stay >= 0.
+            alpha = engine.row(rows[j])
+            up = nonbasic & (alpha > tol)
+            down = nonbasic & (alpha < -tol)
+            lo_o = np.max(d[down] / alpha[down], initial=-np.inf)
+            hi_o = np.min(d[up] / alpha[up], initial=np.inf)
+        else:
+            # Nonbasic: only its own reduced cost moves.
+            lo_o, hi_o = -d[j], np.inf
+        lo[j], hi[j] = (lo_o, hi_o) if signs[j] > 0 else (-hi_o, -lo_o)
+    return lo, hi
+
+
+def _rhs_ranges(engine, model, tol):
+    """Allowed change [lo, hi] of each normalized b_i keeping 0 <= x_B <= u_B."""
+    m = model.n_cons
+    x_b = engine.x_b
+    u_b = engine.upper[engine.basis]
+    signs = np.where(engine.flipped[engine.basis], -1.0, 1.0)
+    lo = np.empty(m)
+    hi = np.empty(m)
+    for i in range(m):
+        e = np.zeros(m)
+        e[i] = 1.0
+        beta = engine.factor.ftran(e) * signs
+        pos, neg = beta > tol, beta < -tol
+        with np.errstate(invalid="ignore"):
+            hi[i] = min(np.min((u_b[pos] - x_b[pos]) / beta[pos], initial=np.inf),
+                        np.min(x_b[neg] / -beta[neg], initial=np.inf))
+            lo[i] = max(np.max(-x_b[pos] / beta[pos], initial=-np.inf),
+                        np.max((u_b[neg] - x_b[neg]) / beta[neg], initial=-np.inf))
+    return lo, hi
@@ -1,45 +1,1008 @@
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 
-def Simplex(coeficentsObjetiveFunction, constraintMatrix, rightOfRestrictions, sense="max", constraints=None):
-    steps = []
-    coeficentsObjetiveFunction = np.array(coeficentsObjetiveFunction, dtype=float)
-    constraintMatrix = np.array(constraintMatrix, dtype=float)
-    rightOfRestrictions = np.array(rightOfRestrictions, dtype=float)
-    
-    if sense == "min":
-        coeficentsObjetiveFunction = -coeficentsObjetiveFunction
-        
-    variablesNumber = len(coeficentsObjetiveFunction)
-    constraintsNumber = len(rightOfRestrictions)
-    tableau = np.zeros((constraintsNumber+1, variablesNumber + constraintsNumber + 1))
-    tableau[:constraintsNumber, :variablesNumber] = constraintMatrix
-    tableau[:constraintsNumber, variablesNumber:variablesNumber+constraintsNumber] = np.eye(constraintsNumber)
-    tableau[:constraintsNumber, -1] = rightOfRestrictions
-    tableau[-1, :variablesNumber] = -coeficentsObjetiveFunction
-    
-    steps.append(tableau.copy())
-    
-    while any(tableau[-1,:-1]<0):
-        col = np.argmin(tableau[-1,:-1])
-        
-        ratios = [tableau[i, -1] / tableau[i, col] if tableau[i, col] > 0 else np.inf for i in range(constraintsNumber)]
-        row = np.argmin(ratios)
-        
-        pivot = tableau[row, col]
-        tableau[row, :] /= pivot
-        for i in range(constraintsNumber+1):
-            if i != row:
-                tableau[i, :] -= tableau[i, col] * tableau[row, :]
-
-        steps.append(tableau.copy())
-        
-    solution = {"Z": float(tableau[-1, -1])}
-    for j in range(variablesNumber):
-        col = tableau[:, j]
-        if list(col[:-1]).count(0) == (constraintsNumber-1) and 1 in col:
-            row = np.where(col == 1)[0][0]
-            solution[f"x{j+1}"] = float(tableau[row, -1])
+from engines import RevisedEngine, TableauEngine
+from factorization import lu_factor, lu_solve, sp
+from history import StepHistory
+from kernels import NUMPY_KERNEL, bounded_ratios, make_kernel
+from pricing import Bland, Dantzig, make_pricing
+from scaling import scale_factors
+
+
+SENSES = ("<=", ">=", "=")
+METHODS = ("tableau", "revised", "sparse")
+# Consecutive degenerate pivots after which pricing falls back to Bland's rule.
+CYCLE_GUARD = 50
+# Pivots between two looks at the clock and the cancellation token.
+CHECK_EVERY = 16
+
+
+class Tolerances:
+    """
+    Numerical tolerances of the simplex core:
+      primal - bound violation still accepted for a basic variable;
+      dual   - a reduced cost must be below -dual to count as improving;
+      pivot  - smallest |alpha| accepted as a pivot element.
+    """
+
+    def __init__(self, primal=1e-9, dual=1e-9, pivot=1e-9):
+        self.primal = primal
+        self.dual = dual
+        self.pivot = pivot
+
+    def __repr__(self):
+        return f"Tolerances(primal={self.primal:g}, dual={self.dual:g}, pivot={self.pivot:g})"
+
+
+DEFAULT_TOLERANCES = Tolerances()
+# float32 carries ~7 digits, so its pivots and tests need a looser threshold.
+LOW_PRECISION_TOLERANCES = Tolerances(primal=1e-5, dual=1e-5, pivot=1e-5)
+
+INTERRUPTED = ("iteration_limit", "time_limit", "cancelled")
+
+DTYPES = (np.float32, np.float64)
+REFINE_SWEEPS = 5
+
+
+def tolerances_for(dtype):
+    """Default Tolerances for arithmetic carried out in `dtype`."""
+    return LOW_PRECISION_TOLERANCES if np.dtype(dtype) == np.float32 else DEFAULT_TOLERANCES
+
+
+class SolveError(ValueError):
+    """
+    A solve that stopped without an optimum. `status` names the outcome,
+    `certificate` (when the solver found one) proves it and `result` (set
+    by Simplex) is the partial SimplexResult.
+    """
+
+    status = None
+
+    def __init__(self, message, certificate=None):
+        super().__init__(message)
+        self.certificate = certificate
+        self.result = None
+
+
+class InfeasibleError(SolveError):
+    """The constraints admit no solution; the certificate is a Farkas vector."""
+
+    status = "infeasible"
+
+
+class UnboundedError(SolveError):
+    """The objective can improve without limit; the certificate is a ray."""
+
+    status = "unbounded"
+
+
+class IterationLimitError(SolveError):
+    """The iteration cap was reached before the optimum."""
+
+    status = "iteration_limit"
+
+
+class TimeLimitError(SolveError):
+    """The wall-clock deadline passed before the optimum."""
+
+    status = "time_limit"
+
+
+class CancelledError(SolveError):
+    """The solve was cancelled through its CancelToken."""
+
+    status = "cancelled"
+
+
+class CancelToken:
+    """Thread-safe flag: another thread calls cancel() to stop a running solve."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+
+class Limits:
+    """
+    When a solve must give up: after `max_iter` iterations (pivots and
+    bound flips), once `time_limit` seconds have passed since the Limits
+    was made, or when `cancel` (a CancelToken) is cancelled. The clock and
+    the token are read every `check_every` iterations only.
+    """
+
+    def __init__(self, max_iter=None, time_limit=None, cancel=None, check_every=CHECK_EVERY):
+        if check_every < 1:
+            raise ValueError("check_every debe ser al menos 1.")
+        self.max_iter = max_iter
+        self.time_limit = time_limit
+        self.deadline = None if time_limit is None else time.monotonic() + time_limit
+        self.cancel = cancel
+        self.check_every = check_every
+
+    def check(self, engine):
+        if self.max_iter is not None and engine.iterations >= self.max_iter:
+            raise IterationLimitError(f"Se alcanzo el limite de {self.max_iter} iteraciones sin llegar al optimo.")
+        if engine.iterations % self.check_every:
+            return
+        if self.cancel is not None and self.cancel.cancelled:
+            raise CancelledError("La resolucion fue cancelada.")
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise TimeLimitError(f"Se agoto el tiempo limite de {self.time_limit:g} s sin llegar al optimo.")
+
+
+def Simplex(coeficentsObjetiveFunction, constraintMatrix, rightOfRestrictions, sense="max", constraints=None, method="tableau", record="all", record_size=10, bounds=None, basis=None, pricing="dantzig", max_iter=None, scaling=None, tolerances=None, raise_on_failure=True, dtype=np.float64, kernel="auto", time_limit=None, cancel=None, check_every=CHECK_EVERY):
+    """
+    Solve max/min c x s.t. A x (<=, >=, =) b, l <= x <= u.
+
+    `constraints` lists the sense of each row ("<=" by default). Rows that
+    are not "<=" get an artificial column and are handled by a Phase I that
+    minimizes the sum of artificials; surplus columns are only added for
+    ">=" rows, and equality rows get no slack at all.
+
+    `bounds` gives one (lower, upper) pair per variable (default (0, None),
+    None meaning 0 below and no limit above). Bounds never become rows: the
+    lower bound is shifted out and the upper bound is enforced by the
+    bounded-variable ratio test, complementing x' = u - x when a variable
+    sits at its upper bound (shown as x' in the tableau).
+
+    method="tableau" pivots the full dense tableau and records every step for
+    the didactic views. method="revised" keeps only the basis (LU + eta
+    updates) and prices columns from the original A; no tableau is formed,
+    so `steps` comes back empty. method="sparse" is the revised method on a
+    CSC copy of A (scipy.sparse input is also kept sparse under "revised"),
+    with the slack block left implicit.
+
+    record controls the tableau history kept by the tableau method: "all"
+    (every tableau), "last" (ring buffer of `record_size` tableaux), "delta"
+    (initial tableau plus pivot rows, replayed on demand) or "none". The
+    returned `steps` is a StepHistory that indexes like a list of tableaux.
+
+    pricing picks the entering column: "dantzig" (most negative reduced
+    cost), "bland" (lowest index), "steepest-edge" or "devex", or any
+    pricing.Pricing instance. Whatever the rule, a run of CYCLE_GUARD
+    degenerate pivots switches to Bland's rule until the objective moves
+    again, so degenerate models cannot cycle. max_iter caps the number of
+    pivots and bound flips (IterationLimitError when reached).
+
+    scaling="geometric" or "equilibrium" rescales the rows and columns of A
+    (powers of two, see scaling.scale_factors) before the solve, which
+    keeps badly scaled data from producing noise pivots; results are
+    reported unscaled, but the recorded tableaux are those of the scaled
+    model. `tolerances` is a Tolerances instance (primal, dual, pivot).
+
+    dtype=np.float32 (tableau method only) pivots a single-precision tableau
+    and records single-precision steps, halving their memory; pivoting then
+    uses LOW_PRECISION_TOLERANCES unless `tolerances` is given. The final
+    basis is refined in float64 (iterative refinement of x_B and y against
+    the float64 basis matrix), so the reported solution, duals and reduced
+    costs are as accurate as a float64 solve. If the refined point shows
+    the basis is not optimal after all, the solve continues in float64 from
+    it. Farkas and ray certificates are recomputed in float64 from the final
+    basis too; only when that basis is numerically singular is the float32
+    certificate kept, accurate to about 1e-5.
+
+    kernel picks the implementation of the pivot's inner loops (elimination
+    and ratio test): "numba" JIT-compiles them (numba must be installed),
+    "numpy" uses the vectorized versions and "auto" takes numba when it is
+    available. The pivots chosen are the same either way.
+
+    max_iter caps the number of pivots and bound flips, time_limit the
+    wall-clock seconds, and cancel (a CancelToken) lets another thread stop
+    the solve; the clock and the token are checked every `check_every`
+    iterations.
+
+    The solve stops at the first proof that there is no optimum, or when a
+    limit interrupts it, and raises InfeasibleError, UnboundedError,
+    IterationLimitError, TimeLimitError or CancelledError. Each carries
+    `status`, `certificate` and `result`, the SimplexResult that
+    raise_on_failure=False returns instead: its `status` is not "optimal";
+    after an interruption it holds the basis reached so far (usable as
+    `basis=` to resume) and, once Phase I is over and that basis is
+    feasible, its x and objective.
+
+    The result unpacks as (steps, solution) and also carries the final
+    `basis`. Passing that Basis back as `basis=` warm-starts a re-solve of a
+    model with the same shape: if the edited model left it primal
+    infeasible (e.g. after changing b) the dual simplex restores
+    feasibility, otherwise the primal simplex continues from it.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Metodo desconocido: '{method}'. Usa 'tableau', 'revised' o 'sparse'.")
+    dtype = np.dtype(dtype)
+    if dtype not in DTYPES:
+        raise ValueError(f"Precision desconocida: '{dtype}'. Usa float32 o float64.")
+    low_precision = dtype != np.float64
+    if low_precision and method != "tableau":
+        raise ValueError("La precision float32 solo esta disponible con el metodo 'tableau'.")
+    kernel = make_kernel(kernel)
+
+    if method == "tableau":
+        model = StandardForm(coeficentsObjetiveFunction, constraintMatrix, rightOfRestrictions, sense, constraints, bounds=bounds, scaling=scaling)
+        steps = StepHistory(record, record_size)
+        engine = TableauEngine(model, steps, dtype, kernel)
+    else:
+        sparse = method == "sparse" or (sp is not None and sp.issparse(constraintMatrix))
+        model = StandardForm(coeficentsObjetiveFunction, constraintMatrix, rightOfRestrictions, sense, constraints, bounds=bounds, sparse=sparse, scaling=scaling)
+        steps = StepHistory("none")
+        engine = RevisedEngine(model, kernel=kernel)
+
+    pricing = make_pricing(pricing)
+    tols = tolerances or tolerances_for(dtype)
+    limits = Limits(max_iter, time_limit, cancel, check_every)
+    try:
+        if basis is None:
+            _two_phase(engine, model, tols, pricing, limits)
         else:
-            solution[f"x{j+1}"] = 0
+            _warm_start(engine, model, basis, tols, pricing, limits)
+        x = y = None
+        if low_precision:
+            final_tols = tolerances or DEFAULT_TOLERANCES
+            x, y = _refine(engine, model, final_tols)
+            if x is None:
+                engine = _polish(engine, model, steps, final_tols, pricing, limits)
+    except SolveError as exc:
+        if low_precision and exc.status == "unbounded":
+            exc.certificate = _refined_ray(engine, model, exc.certificate)
+        exc.certificate = model.certificate(exc)
+        exc.result = _partial_result(engine, model, steps, exc, tols)
+        if raise_on_failure:
+            raise
+        return exc.result
+    if x is None:
+        x, y = engine.values(), engine.duals(model)
+    duals, reduced_costs = model.dual_solution(y)
+    return SimplexResult(
+        steps, model.solution(x), _final_basis(engine, model), engine.iterations,
+        x=model.primal(x), duals=duals, reduced_costs=reduced_costs,
+    )
+
+
+class Basis:
+    """
+    A simplex basis: the column basic in each row and which non-artificial
+    columns are complemented (at their upper bound). Column indices follow
+    StandardForm: x1..xn first, then one slack/surplus per inequality row.
+    """
+
+    def __init__(self, basic, flipped):
+        self.basic = np.array(basic, dtype=int)
+        self.flipped = np.array(flipped, dtype=bool)
+
+    def __repr__(self):
+        return f"Basis(basic={self.basic.tolist()})"
+
+
+class SimplexResult:
+    """
+    Outcome of Simplex(). Unpacks as (steps, solution) like the original
+    tuple; `basis` (None if an artificial stayed basic on a redundant row)
+    feeds a warm start and `iterations` counts pivots and bound flips.
+
+    Array views of the optimum, in the terms of the original model:
+    `x` (one value per variable), `objective` (Z), `duals` (shadow price
+    dZ/db_i of each constraint) and `reduced_costs` (c_j - y^T A_j, the rate
+    at which Z changes if x_j is pushed off its bound). All are read off
+    the final basis, never searched for in the tableau.
+
+    `status` is "optimal", "infeasible", "unbounded", or one of INTERRUPTED
+    ("iteration_limit", "time_limit", "cancelled") when a limit stopped the
+    solve first. `certificate` backs the two proven failures up:
+      infeasible - a Farkas vector y over the constraints with y_i >= 0 on
+                   "<=" rows, y_i <= 0 on ">=" rows and
+                   y^T b < min over l <= x <= u of y^T A x,
+                   so no x can satisfy all rows at once;
+      unbounded  - a ray d with A d (<=, >=, =) 0 row by row, d within the
+                   infinite side of the bounds and c d improving the
+                   objective, so x + t d stays feasible for every t >= 0.
+    """
+
+    def __init__(self, steps, solution, basis, iterations, x=None, duals=None, reduced_costs=None, status="optimal", certificate=None):
+        self.steps = steps
+        self.solution = solution
+        self.basis = basis
+        self.iterations = iterations
+        self.x = x
+        self.objective = solution["Z"] if solution is not None else None
+        self.duals = duals
+        self.reduced_costs = reduced_costs
+        self.status = status
+        self.certificate = certificate
+
+    def __iter__(self):
+        return iter((self.steps, self.solution))
+
+    def __getitem__(self, k):
+        return (self.steps, self.solution)[k]
+
+
+class StandardForm:
+    """
+    An LP rewritten as min cost x s.t. [A | L] x = b, x >= 0 with b >= 0.
+
+    Variables are shifted by their lower bound (x = l + x'), so x' has
+    bounds [0, upper]. Rows with a negative right-hand side (after the
+    shift) are negated, flipping their sense.
+    L holds one logical column per slack (<=), surplus (>=) and artificial
+    (>= and =) variable: column n_vars + k is logical_signs[k] times the unit
+    vector of row logical_rows[k]. Artificial columns form the trailing block
+    so they can be dropped once Phase I is over.
+    """
+
+    def __init__(self, c, A, b, sense="max", constraints=None, bounds=None, sparse=False, scaling=None):
+        if sense not in ("max", "min"):
+            raise ValueError(f"Tipo de problema desconocido: '{sense}'. Usa 'max' o 'min'.")
+        self.c = np.array(c, dtype=float)
+        self.sense = sense
+        self.sparse = sparse
+        b = np.array(b, dtype=float)
+        self.n_vars = len(self.c)
+        self.n_cons = len(b)
+
+        senses = ["<="] * self.n_cons if constraints is None else list(constraints)
+        if len(senses) != self.n_cons:
+            raise ValueError("Debe haber un tipo de restriccion ('<=', '>=', '=') por cada fila.")
+        for s in senses:
+            if s not in SENSES:
+                raise ValueError(f"Tipo de restriccion desconocido: '{s}'.")
+
+        self.lower, upper = _parse_bounds(bounds, self.n_vars)
+        if sparse:
+            A = sparse_matrix(A, self.n_vars)
+        else:
+            if sp is not None and sp.issparse(A):
+                A = A.toarray()
+            A = np.array(A, dtype=float).reshape(self.n_cons, self.n_vars)
+        if self.lower.any():
+            b = b - A @ self.lower
+
+        # Make b >= 0 so the slack/artificial basis starts primal feasible.
+        self.row_sign = np.where(b < 0, -1.0, 1.0)
+        flip = {"<=": ">=", ">=": "<=", "=": "="}
+        self.senses = [flip[s] if sign < 0 else s for s, sign in zip(senses, self.row_sign)]
+        self.b = b * self.row_sign
+        if sparse:
+            self.A = sp.csc_matrix(sp.diags(self.row_sign) @ A)
+        else:
+            self.A = A * self.row_sign[:, None]
+
+        # Optional scaling: A' = R A S, b' = R b, x = S x'.
+        self.row_scale = np.ones(self.n_cons)
+        self.col_scale = np.ones(self.n_vars)
+        if scaling is not None:
+            self.row_scale, self.col_scale = scale_factors(self.A, scaling)
+            if sparse:
+                self.A = sp.csc_matrix(sp.diags(self.row_scale) @ self.A @ sp.diags(self.col_scale))
+            else:
+                self.A = self.A * self.row_scale[:, None] * self.col_scale
+            self.b = self.b * self.row_scale
+
+        rows, signs, names = [], [], []
+        for i, s in enumerate(self.senses):
+            if s != "=":
+                rows.append(i)
+                signs.append(1.0 if s == "<=" else -1.0)
+                names.append(f"s{i+1}")
+        n_slack = len(rows)
+        artificial_rows = [i for i, s in enumerate(self.senses) if s != "<="]
+        rows += artificial_rows
+        signs += [1.0] * len(artificial_rows)
+        names += [f"a{i+1}" for i in artificial_rows]
+
+        self.logical_rows = np.array(rows, dtype=int)
+        self.logical_signs = np.array(signs)
+        self.n_artificial = len(artificial_rows)
+        self.n_cols = self.n_vars + len(rows)
+        self.names = [f"x{j+1}" for j in range(self.n_vars)] + names
+        self.artificial = np.zeros(self.n_cols, dtype=bool)
+        self.artificial[self.n_cols - self.n_artificial:] = True
+
+        self.cost = np.zeros(self.n_cols)
+        self.cost[:self.n_vars] = (-self.c if sense == "max" else self.c) * self.col_scale
+        self.upper = np.full(self.n_cols, np.inf)
+        self.upper[:self.n_vars] = (upper - self.lower) / self.col_scale
+
+        # Starting basis: the slack of each "<=" row, the artificial otherwise.
+        self.initial_basis = np.empty(self.n_cons, dtype=int)
+        for k, i in enumerate(self.logical_rows[:n_slack]):
+            if self.senses[i] == "<=":
+                self.initial_basis[i] = self.n_vars + k
+        for k, i in enumerate(artificial_rows):
+            self.initial_basis[i] = self.n_vars + n_slack + k
+
+    def update(self, c=None, b=None):
+        """Swap in a new objective and/or right-hand side, keeping the layout."""
+        if c is not None:
+            self.c = np.array(c, dtype=float)
+            self.cost[:self.n_vars] = (-self.c if self.sense == "max" else self.c) * self.col_scale
+        if b is not None:
+            # Rows keep the sign chosen at construction; a sign change just
+            # leaves the current basis primal infeasible.
+            b = self.row_scale * self.row_sign * np.array(b, dtype=float)
+            self.b = b - self.A @ (self.lower / self.col_scale)
+
+    def set_bounds(self, lower, upper):
+        """
+        Swap in new variable bounds (e.g. a branch-and-bound node), keeping
+        the layout. Like update(), rows keep the sign chosen at construction.
+        """
+        lower = np.array(lower, dtype=float)
+        upper = np.array(upper, dtype=float)
+        if (upper < lower).any():
+            j = int(np.flatnonzero(upper < lower)[0])
+            raise InfeasibleError(f"El problema no tiene solucion factible: x{j+1} tiene cota superior menor que la inferior.")
+        self.b = self.b - self.A @ ((lower - self.lower) / self.col_scale)
+        self.lower = lower
+        self.upper[:self.n_vars] = (upper - lower) / self.col_scale
+
+    def phase_one_cost(self):
+        cost = np.zeros(self.n_cols)
+        cost[self.artificial] = 1.0
+        return cost
+
+    def dense_A(self):
+        return self.A.toarray() if self.sparse else self.A
+
+    def column(self, j):
+        """Dense copy of column j of [A | L]."""
+        e = np.zeros(self.n_cons)
+        if j >= self.n_vars:
+            k = j - self.n_vars
+            e[self.logical_rows[k]] = self.logical_signs[k]
+        elif self.sparse:
+            lo, hi = self.A.indptr[j], self.A.indptr[j + 1]
+            e[self.A.indices[lo:hi]] = self.A.data[lo:hi]
+        else:
+            e[:] = self.A[:, j]
+        return e
+
+    def price(self, y):
+        """y^T [A | L] for every column."""
+        return np.concatenate([self.A.T @ y, self.logical_signs * y[self.logical_rows]])
+
+    def basis_matrix(self, basis):
+        if not self.sparse:
+            return np.column_stack([self.column(j) for j in basis])
+        structural = basis < self.n_vars
+        k = basis[~structural] - self.n_vars
+        L = sp.csc_matrix(
+            (self.logical_signs[k], (self.logical_rows[k], np.arange(len(k)))),
+            shape=(self.n_cons, len(k)),
+        )
+        B = sp.hstack([self.A[:, basis[structural]], L], format="csc")
+        # hstack groups the columns; restore the row order of the basis.
+        order = np.concatenate([np.flatnonzero(structural), np.flatnonzero(~structural)])
+        return B[:, np.argsort(order)]
+
+    def dual_solution(self, y):
+        """
+        Map multipliers y of the min-form rows back to the original model:
+        shadow prices per original row and reduced costs per variable, both
+        in the sense of the original objective.
+        """
+        sign = -1.0 if self.sense == "max" else 1.0
+        reduced_costs = sign * (self.cost[:self.n_vars] - self.A.T @ y) / self.col_scale
+        return sign * self.row_sign * self.row_scale * y, reduced_costs
+
+    def certificate(self, exc):
+        """Express the standard-form certificate of `exc` in the original model."""
+        if exc.certificate is None:
+            return None
+        if exc.status == "infeasible":
+            return exc.certificate * self.row_sign * self.row_scale
+        if exc.status == "unbounded":
+            ray = exc.certificate[:self.n_vars] * self.col_scale
+            return ray / np.abs(ray).max()
+        return None
+
+    def primal(self, x):
+        """Original variables from a column vector of the standard form."""
+        return x[:self.n_vars] * self.col_scale + self.lower
+
+    def solution(self, x):
+        x = self.primal(x)
+        solution = {"Z": float(self.c @ x)}
+        for j in range(self.n_vars):
+            solution[f"x{j+1}"] = float(x[j])
+        return solution
+
+
+def _parse_bounds(bounds, n_vars):
+    lower = np.zeros(n_vars)
+    upper = np.full(n_vars, np.inf)
+    if bounds is None:
+        return lower, upper
+    bounds = list(bounds)
+    if len(bounds) != n_vars:
+        raise ValueError("Debe haber una cota (inferior, superior) por cada variable.")
+    for j, (lo, hi) in enumerate(bounds):
+        lower[j] = 0.0 if lo is None else float(lo)
+        upper[j] = np.inf if hi is None else float(hi)
+        if not np.isfinite(lower[j]):
+            raise ValueError(f"La cota inferior de x{j+1} debe ser finita.")
+        if upper[j] < lower[j]:
+            raise InfeasibleError(f"El problema no tiene solucion factible: x{j+1} tiene cota superior menor que la inferior.")
+    return lower, upper
+
+
+def _two_phase(engine, model, tols=DEFAULT_TOLERANCES, pricing=None, limits=None):
+    if model.n_artificial:
+        engine.set_objective(model.phase_one_cost())
+        _primal_simplex(engine, np.ones(model.n_cols, dtype=bool), tols, pricing, limits)
+        # Phase I sums m artificials, so allow more than one primal tolerance.
+        if engine.objective() > 100 * tols.primal * max(1.0, np.abs(model.b).max()):
+            raise InfeasibleError(
+                "El problema no tiene solucion factible: la Fase I termino con artificiales positivas.",
+                _farkas(model, engine.duals(model), tols),
+            )
+        _drive_out_artificials(engine, model, tols)
+        engine.end_phase_one(model)
+        engine.upper[model.artificial] = 0.0
+    engine.set_objective(model.cost)
+    _primal_simplex(engine, ~model.artificial, tols, pricing, limits)
+
+
+def _warm_start(engine, model, basis, tols=DEFAULT_TOLERANCES, pricing=None, limits=None):
+    n_real = model.n_cols - model.n_artificial
+    if len(basis.basic) != model.n_cons or len(basis.flipped) != n_real or (basis.basic >= n_real).any():
+        raise ValueError("La base inicial no corresponde a las dimensiones del modelo.")
+    try:
+        engine.load_basis(model, basis)
+    except (np.linalg.LinAlgError, RuntimeError) as exc:
+        raise ValueError("La base inicial es singular.") from exc
+    if not np.all(np.isfinite(engine.x_b)):
+        raise ValueError("La base inicial es singular.")
+
+    engine.upper[model.artificial] = 0.0
+    _reoptimize(engine, model, tols, pricing, limits)
+
+
+def _reoptimize(engine, model, tols=DEFAULT_TOLERANCES, pricing=None, limits=None):
+    """Finish a solve from whatever basis the engine currently holds."""
+    eligible = ~model.artificial
+    engine.set_objective(model.cost)
+    if not _primal_feasible(engine, tols):
+        if _dual_feasible(engine, eligible, tols):
+            _dual_simplex(engine, model, eligible, tols, limits)
+        else:
+            # Neither feasibility holds: with a zero objective every basis is
+            # dual feasible, so the dual simplex acts as a Phase I.
+            engine.set_objective(np.zeros(model.n_cols))
+            _dual_simplex(engine, model, eligible, tols, limits)
+            engine.set_objective(model.cost)
+    _primal_simplex(engine, eligible, tols, pricing, limits)
+
+
+def _partial_result(engine, model, steps, exc, tols):
+    """SimplexResult of a solve stopped by `exc`, keeping what it had reached."""
+    if exc.status not in INTERRUPTED:
+        return SimplexResult(steps, None, None, engine.iterations, status=exc.status, certificate=exc.certificate)
+    basis = _final_basis(engine, model)
+    in_phase_one = np.isinf(engine.upper[model.artificial]).any()
+    if in_phase_one or not _primal_feasible(engine, tols):
+        return SimplexResult(steps, None, basis, engine.iterations, status=exc.status)
+    # Phase II only improves the objective, so this basis is the best one seen.
+    x = engine.values()
+    return SimplexResult(steps, model.solution(x), basis, engine.iterations, x=model.primal(x), status=exc.status)
+
+
+def _refined_solver(M, dtype):
+    """
+    Solve M z = v (or M^T z = v) to float64 accuracy with a factorization of
+    M in `dtype`: each refinement sweep corrects z by the low-precision
+    solution of the float64 residual.
+    """
+    low = M.astype(dtype)
+    if lu_factor is not None:
+        factor = lu_factor(low)
+        solve_low = lambda v, trans: lu_solve(factor, v.astype(dtype), trans=trans)
+    else:
+        solve_low = lambda v, trans: np.linalg.solve(low.T if trans else low, v.astype(dtype))
+    eps = np.finfo(np.float64).eps * max(1.0, np.abs(M).max()) * len(M)
+
+    def solve(v, trans=0):
+        op = M.T if trans else M
+        z = solve_low(v, trans).astype(np.float64)
+        for _ in range(REFINE_SWEEPS):
+            residual = v - op @ z
+            if np.abs(residual).max() <= eps * max(1.0, np.abs(z).max()):
+                break
+            z += solve_low(residual, trans)
+        return z
+
+    return solve
+
+
+def _refine(engine, model, tols):
+    """
+    Recompute the final basic solution and multipliers of a low-precision
+    tableau in float64. Returns (x, y), or (None, None) if the float64
+    values show the basis is not primal and dual feasible.
+    """
+    basis, rows = engine.basis, engine.rows
+    n = engine.n_cols
+    x = np.zeros(model.n_cols)
+    at_upper = engine.flipped.copy()
+    at_upper[basis] = False
+    x[at_upper] = engine.upper[at_upper]
+    y = np.zeros(model.n_cons)
+    if len(basis):
+        rhs = model.b.copy()
+        for j in np.flatnonzero(at_upper):
+            rhs -= x[j] * model.column(j)
+        solve = _refined_solver(model.basis_matrix(basis)[rows], engine.dtype)
+        x[basis] = solve(rhs[rows])
+        y[rows] = solve(engine.cost[basis], trans=1)
+
+    x_b, upper_b = x[basis], engine.upper[basis]
+    if (x_b < -tols.primal).any() or (x_b > upper_b + tols.primal).any():
+        return None, None
+    d = engine.cost[:n] - model.price(y)[:n]
+    nonbasic = np.ones(n, dtype=bool)
+    nonbasic[basis] = False
+    movable = nonbasic & (engine.upper[:n] > 0)
+    if (d[movable & ~at_upper[:n]] < -tols.dual).any() or (d[movable & at_upper[:n]] > tols.dual).any():
+        return None, None
+    return x, y
+
+
+def _refined_ray(engine, model, ray):
+    """
+    Recompute in float64 the ray a low-precision tableau found: x_q enters
+    (the one nonbasic entry of `ray`) and the basic variables move along
+    -B^-1 a_q, so only that column is solved for again. The float32 ray is
+    kept if the basis is too ill-conditioned for the float64 one to do
+    better (measured by _ray_error).
+    """
+    nonbasic = np.ones(len(ray), dtype=bool)
+    nonbasic[engine.basis] = False
+    q = int(np.flatnonzero(nonbasic & (ray != 0))[0])
+    B = model.basis_matrix(engine.basis)
+    B = B.toarray() if sp is not None and sp.issparse(B) else B
+    B = B[engine.rows]
+    refined = np.zeros(len(ray))
+    refined[q] = ray[q]
+    try:
+        refined[engine.basis] = -ray[q] * np.linalg.solve(B, model.column(q)[engine.rows])
+    except np.linalg.LinAlgError:
+        return ray
+    if not np.isfinite(refined).all():
+        return ray
+    a_q = model.column(q)[engine.rows]
+    if _ray_error(B, a_q, refined, engine, q) <= _ray_error(B, a_q, ray, engine, q):
+        return refined
+    return ray
+
+
+def _ray_error(B, a_q, ray, engine, q):
+    """How far `ray` is from B d_B + a_q d_q = 0 with d >= 0 on the unbounded columns, relative to its size."""
+    d_b = ray[engine.basis]
+    residual = np.abs(B @ d_b + a_q * ray[q]).max(initial=0.0)
+    unbounded = np.isinf(engine.upper[engine.basis])
+    sign = max(0.0, -d_b[unbounded].min(initial=0.0), np.abs(d_b[~unbounded]).max(initial=0.0))
+    return (residual + sign) / np.abs(ray).max()
+
+
+def _polish(engine, model, steps, tols, pricing, limits):
+    """Continue a low-precision solve in float64 from its final basis."""
+    polished = TableauEngine(model, steps, kernel=engine.kernel)
+    polished.iterations = engine.iterations
+    basis = _final_basis(engine, model)
+    if basis is None:
+        _two_phase(polished, model, tols, pricing, limits)
+    else:
+        _warm_start(polished, model, basis, tols, pricing, limits)
+    return polished
+
+
+def _final_basis(engine, model):
+    n_real = model.n_cols - model.n_artificial
+    if len(engine.basis) != model.n_cons or (engine.basis >= n_real).any():
+        return None
+    return Basis(engine.basis.copy(), engine.flipped[:n_real].copy())
+
+
+def _primal_feasible(engine, tols):
+    x_b = engine.x_b
+    return bool(np.all(x_b >= -tols.primal) and np.all(x_b <= engine.upper[engine.basis] + tols.primal))
+
+
+def _dual_feasible(engine, eligible, tols):
+    d = engine.reduced_costs()
+    return bool(np.all(d[eligible[:engine.n_cols]] >= -tols.dual))
+
+
+def _farkas(model, y, tols):
+    """
+    Turn multipliers y of the standard-form rows into a Farkas certificate
+    f = +-y with f^T b < min over 0 <= x <= u of f^T [A | L] x (artificials
+    excluded), or None if neither sign proves infeasibility.
+    """
+    real = ~model.artificial
+    upper = model.upper[real]
+    best, best_margin = None, tols.primal
+    for f in (y, -y):
+        p = model.price(f)[real]
+        low = p < -tols.pivot
+        if np.isinf(upper[low]).any():
+            continue
+        margin = p[low] @ upper[low] - f @ model.b
+        if margin > best_margin:
+            best, best_margin = f, margin
+    return best
+
+
+def _check_limit(engine, limits):
+    if limits is not None:
+        limits.check(engine)
+
+
+def _dual_simplex(engine, model, eligible, tols, limits=None):
+    """
+    Bounded dual simplex: keeps the reduced costs >= 0 while driving the
+    most infeasible basic variable to the bound it violates.
+    """
+    eligible = eligible[:engine.n_cols]
+    while True:
+        x_b = engine.x_b
+        upper_b = engine.upper[engine.basis]
+        violation = np.maximum(-x_b, x_b - upper_b)
+        r = int(np.argmax(violation)) if len(violation) else 0
+        if not len(violation) or violation[r] <= tols.primal:
+            return
+        _check_limit(engine, limits)
+        to_upper = bool(x_b[r] > upper_b[r])
+
+        alpha_r = engine.row(r)
+        d = np.maximum(engine.reduced_costs(), 0.0)
+        candidates = eligible.copy()
+        candidates[engine.basis] = False
+        candidates &= alpha_r > tols.pivot if to_upper else alpha_r < -tols.pivot
+        if not candidates.any():
+            # Row r of B^-1 [A | L] x = B^-1 b cannot reach its bound.
+            raise InfeasibleError(
+                "El problema no tiene solucion factible: la fila de una variable basica no admite pivote.",
+                _farkas(model, engine.basis_row(model, r), tols),
+            )
+        ratios = np.full(len(d), np.inf)
+        ratios[candidates] = d[candidates] / np.abs(alpha_r[candidates])
+        q = int(np.argmin(ratios))
+
+        alpha = engine.column(q)
+        target = upper_b[r] if to_upper else 0.0
+        engine.pivot(r, q, alpha, (x_b[r] - target) / alpha[r], to_upper)
+
+
+def _primal_simplex(engine, eligible, tols, pricing=None, limits=None):
+    eligible = eligible[:engine.n_cols]
+    pricing = pricing or Dantzig()
+    pricing.reset(engine)
+    bland = Bland()
+    degenerate = 0
+    while True:
+        d = engine.reduced_costs()
+        rule = bland if degenerate >= CYCLE_GUARD else pricing
+        q = rule.select(d, eligible, tols.dual)
+        if q is None:
+            return
+        _check_limit(engine, limits)
+        alpha = engine.column(q)
+        basis = engine.basis if rule is bland else None
+        r, theta, at_upper = _ratio_test(alpha, engine.x_b, engine.upper[engine.basis], tols, basis, engine.kernel)
+        if not np.isfinite(min(theta, engine.upper[q])):
+            # x_q grows without limit: its column gives the ray (raw orientation).
+            ray = np.zeros(len(engine.flipped))
+            ray[engine.basis] = -alpha * np.where(engine.flipped[engine.basis], -1.0, 1.0)
+            ray[q] = -1.0 if engine.flipped[q] else 1.0
+            raise UnboundedError("El problema es no acotado: la funcion objetivo crece sin limite.", ray)
+        if engine.upper[q] <= theta:
+            # The entering variable reaches its own bound first: no pivot.
+            step = engine.upper[q]
+            engine.flip(q, alpha)
+        else:
+            step = theta
+            pricing.before_pivot(engine, r, q, alpha)
+            engine.pivot(r, q, alpha, theta, at_upper)
+        degenerate = degenerate + 1 if step <= tols.primal else 0
+
+
+def _ratio_test(alpha, x_b, upper_b, tols, basis=None, kernel=NUMPY_KERNEL):
+    """
+    Bounded minimum-ratio test: a basic variable leaves when it drops to 0
+    (alpha > 0) or climbs to its upper bound (alpha < 0). Returns the row,
+    the step length and whether the leaving variable stops at its upper
+    bound, or (None, inf, False) if no basic variable limits the step.
+    Given `basis`, ties go to the lowest basic column index (Bland);
+    otherwise the search runs in `kernel`.
+    """
+    if basis is None:
+        r, theta, at_upper = kernel.ratio_test(alpha, x_b, upper_b, tols.pivot)
+        if r < 0:
+            return None, np.inf, False
+        return int(r), max(float(theta), 0.0), bool(at_upper)
+    ratios, up = bounded_ratios(alpha, x_b, upper_b, tols.pivot)
+    if not len(ratios):
+        return None, np.inf, False
+    r = int(np.argmin(ratios))
+    if not np.isfinite(ratios[r]):
+        return None, np.inf, False
+    ties = np.flatnonzero(ratios <= ratios[r] + tols.primal)
+    r = int(ties[np.argmin(basis[ties])])
+    return r, max(ratios[r], 0.0), bool(up[r])
+
+
+def _drive_out_artificials(engine, model, tols):
+    # After a feasible Phase I, swap any artificial still basic (at zero) for
+    # a real column of its row; rows with no such column are redundant.
+    n_real = model.n_cols - model.n_artificial
+    for r in np.flatnonzero(model.artificial[engine.basis]):
+        candidates = np.flatnonzero(np.abs(engine.row(r)[:n_real]) > tols.pivot)
+        if len(candidates):
+            q = int(candidates[0])
+            alpha = engine.column(q)
+            engine.pivot(r, q, alpha, engine.x_b[r] / alpha[r])
+
+
+class BatchResult:
+    """
+    Per-scenario arrays from solve_batch(): `objective` (k,), `x` (k, n),
+    `status` (k,) with "optimal", "infeasible", "unbounded" or
+    "iteration_limit", and
+    `iterations` (k,). Rows that are not optimal hold NaN.
+    """
+
+    def __init__(self, objective, x, status, iterations):
+        self.objective = objective
+        self.x = x
+        self.status = status
+        self.iterations = iterations
+
+    @classmethod
+    def concatenate(cls, parts):
+        return cls(
+            np.concatenate([p.objective for p in parts]),
+            np.concatenate([p.x for p in parts]),
+            np.concatenate([p.status for p in parts]),
+            np.concatenate([p.iterations for p in parts]),
+        )
+
+
+def solve_batch(A, C, B, sense="max", constraints=None, bounds=None, method="revised", processes=None, pricing="dantzig", max_iter=None, scaling=None, tolerances=None):
+    """
+    Solve k LPs that share A (and senses/bounds) but differ in c and/or b.
+
+    C is (k, n) or a single (n,) objective; B is (k, m) or a single (m,)
+    right-hand side. Scenarios are solved in order on one revised engine:
+    each new c/b is swapped into the same factorization and re-optimized
+    from the previous scenario's basis (dual simplex after b changes,
+    primal after c changes), so neighbouring scenarios cost a few pivots.
+    Unrelated scenarios gain nothing from that basis, so a scenario is
+    solved cold instead when its basis has at least as many infeasible
+    basic variables as a cold solve has taken pivots on average, or when
+    the re-optimization runs past that many pivots; such a batch then costs
+    about what a loop of Simplex() calls does. With processes > 1 the scenarios are split into contiguous chunks, one
+    engine per worker process. `pricing`, `scaling` and `tolerances` are
+    as in Simplex(); `max_iter` caps the iterations spent on each scenario.
+    """
+    if method not in ("revised", "sparse"):
+        raise ValueError("solve_batch usa el metodo revisado: method='revised' o 'sparse'.")
+    C = np.atleast_2d(np.asarray(C, dtype=float))
+    B = np.atleast_2d(np.asarray(B, dtype=float))
+    k = max(len(C), len(B))
+    C = np.broadcast_to(C, (k, C.shape[1]))
+    B = np.broadcast_to(B, (k, B.shape[1]))
+
+    options = {"pricing": pricing, "max_iter": max_iter, "scaling": scaling, "tolerances": tolerances}
+    if processes and processes > 1 and k > 1:
+        chunks = [idx for idx in np.array_split(np.arange(k), processes) if len(idx)]
+        jobs = [(A, C[idx], B[idx], sense, constraints, bounds, method, options) for idx in chunks]
+        with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+            return BatchResult.concatenate(list(pool.map(_solve_chunk, jobs)))
+    return _solve_chunk((A, C, B, sense, constraints, bounds, method, options))
+
+
+def _solve_chunk(job):
+    A, C, B, sense, constraints, bounds, method, options = job
+    pricing = make_pricing(options["pricing"])
+    tols = options["tolerances"] or DEFAULT_TOLERANCES
+    max_iter = options["max_iter"]
+    k, n_vars = C.shape
+    objective = np.full(k, np.nan)
+    x = np.full((k, n_vars), np.nan)
+    status = np.empty(k, dtype="<U15")
+    iterations = np.zeros(k, dtype=int)
+    sparse = method == "sparse" or (sp is not None and sp.issparse(A))
+
+    model = engine = None
+    # Iterations of the cold solves so far: what a warm start has to beat.
+    cold = []
+    for s in range(k):
+        spent = 0
+        warm = engine is not None
+        if warm:
+            model.update(C[s], B[s])
+            engine.refresh()
+            # The dual simplex needs about one pivot per infeasible basic
+            # variable, so a basis far from the new b goes cold straight away.
+            budget = max(1, int(np.mean(cold)))
+            warm = _primal_infeasibilities(engine, tols) < budget
+        try:
+            if warm:
+                start = engine.iterations
+                cap = budget if max_iter is None else min(budget, max_iter)
+                try:
+                    _reoptimize(engine, model, tols, pricing, Limits(start + cap))
+                except IterationLimitError:
+                    if cap == max_iter:
+                        raise
+                    spent = engine.iterations - start
+                    warm = False
+            if not warm:
+                model = StandardForm(C[s], A, B[s], sense, constraints, bounds=bounds, sparse=sparse, scaling=options["scaling"])
+                engine = RevisedEngine(model)
+                start = -spent
+                limits = None if max_iter is None else Limits(max_iter - spent)
+                _two_phase(engine, model, tols, pricing, limits)
+            x[s] = model.primal(engine.values())
+            objective[s] = C[s] @ x[s]
+            status[s] = "optimal"
+        except SolveError as exc:
+            status[s] = exc.status
+        if engine is None:
+            continue
+        iterations[s] = engine.iterations - start
+        if not warm:
+            cold.append(engine.iterations)
+        if np.isinf(engine.upper[model.artificial]).any():
+            # Failed inside Phase I: that basis is no use, start the next one cold.
+            engine = None
+    return BatchResult(objective, x, status, iterations)
+
+
+def _primal_infeasibilities(engine, tols):
+    x_b = engine.x_b
+    return int(np.sum(x_b < -tols.primal) + np.sum(x_b > engine.upper[engine.basis] + tols.primal))
+
+
+def min_ratio_row(tableau, col, pivot_tol=0.0):
+    """
+    Minimum-ratio test over the constraint rows of `col` (masked divide, no
+    Python loop); entries up to `pivot_tol` are not accepted as pivots.
+    Returns None when no entry is, i.e. the column is an unbounded direction.
+    """
+    column = tableau[:-1, col]
+    positive = column > pivot_tol
+    ratios = np.full(column.shape, np.inf)
+    ratios[positive] = tableau[:-1, -1][positive] / column[positive]
+    row = int(np.argmin(ratios)) if len(ratios) else None
+    return row if row is not None and np.isfinite(ratios[row]) else None
+
 
-    return steps, solution
\ No newline at end of file
+def sparse_matrix(rows, n_cols=None):
+    """
+    Build a CSC matrix from a scipy.sparse matrix or a list of rows (as
+    returned by parse_manual_input / parse_problem), keeping only nonzeros
+    and never allocating the dense array.
+    """
+    if sp is None:
+        raise ImportError("El backend disperso requiere scipy (pip install scipy).")
+    if sp.issparse(rows):
+        return sp.csc_matrix(rows, dtype=float)
+    row_idx, col_idx, data = [], [], []
+    for i, row in enumerate(rows):
+        for j, value in enumerate(row):
+            if value:
+                row_idx.append(i)
+                col_idx.append(j)
+                data.append(float(value))
+    if n_cols is None:
+        n_cols = max((len(row) for row in rows), default=0)
+    return sp.csc_matrix((data, (row_idx, col_idx)), shape=(len(rows), n_cols))